@@ -0,0 +1,202 @@
+"""
+Control de admisión para la API Unificada de Premios Nobel
+Un pool de concurrencia acotado por clase de endpoint (lecturas, escrituras, exportación, administración)
+con límite adaptativo según la latencia observada
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from starlette.responses import JSONResponse
+
+ADMISSION_CLASSES = {
+    "read": {"limit": 64, "min_limit": 8, "max_limit": 256, "max_queue": 256, "queue_timeout": 2.0, "target_latency": 0.05},
+    "write": {"limit": 4, "min_limit": 1, "max_limit": 16, "max_queue": 16, "queue_timeout": 1.0, "target_latency": 0.25},
+    "export": {"limit": 2, "min_limit": 1, "max_limit": 4, "max_queue": 4, "queue_timeout": 5.0, "target_latency": 10.0},
+    "admin": {"limit": 2, "min_limit": 1, "max_limit": 4, "max_queue": 4, "queue_timeout": 5.0, "target_latency": 2.0},
+}
+EXEMPT_PATHS = ("/healthz", "/readyz", "/changes/stream")
+EXPORT_PATHS = ("/export",)
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+LATENCY_ALPHA = 0.2
+
+def classify_request(method: str, path: str) -> Optional[str]:
+    """Retorna la clase de admisión de una solicitud, o None si está exenta."""
+    if path in EXEMPT_PATHS:
+        return None
+    if path.startswith("/admin"):
+        return "admin"
+    if path in EXPORT_PATHS:
+        # Las descargas masivas tardan segundos: en el pool de lecturas bajarían su límite.
+        return "export"
+    if method in WRITE_METHODS:
+        return "write"
+    return "read"
+
+class AdmissionPool:
+    """
+    Pool con `limit` solicitudes en curso y una cola de espera de `max_queue`.
+    Si la cola está llena, o la espera supera `queue_timeout`, la solicitud se rechaza.
+
+    El límite se ajusta con AIMD: crece de a una solicitud por "ventana" completa
+    mientras la latencia promedio (EWMA) esté por debajo de `target_latency`,
+    y se reduce un 10% cuando la supera.
+    """
+
+    def __init__(self, name: str, limit: int, min_limit: int, max_limit: int,
+                 max_queue: int, queue_timeout: float, target_latency: float):
+        self.name = name
+        self.limit = float(limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.admitted = 0
+        self.rejected = 0
+        self._waiters: deque = deque()
+
+    def _capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self) -> bool:
+        """Retorna True si la solicitud fue admitida (de inmediato o tras esperar en la cola)."""
+        if self.in_flight < self._capacity() and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                self.admitted += 1
+                return True
+            waiter.cancel()
+            self._discard(waiter)
+            self.rejected += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            else:
+                waiter.cancel()
+                self._discard(waiter)
+            raise
+        self.admitted += 1
+        return True
+
+    def _discard(self, waiter):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, latency: Optional[float]):
+        """Libera un lugar, actualiza el límite adaptativo y despierta a los que esperan."""
+        self.in_flight -= 1
+        if latency is not None:
+            self._observe(latency)
+        while self._waiters and self.in_flight < self._capacity():
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(True)
+
+    def _observe(self, latency: float):
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += LATENCY_ALPHA * (latency - self.latency_ewma)
+        if self.latency_ewma > self.target_latency:
+            self.limit = max(self.min_limit, self.limit * 0.9)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / max(self.limit, 1))
+
+    def retry_after(self) -> int:
+        """Segundos sugeridos para reintentar, según la cola y la latencia observada."""
+        latency = self.latency_ewma or self.target_latency
+        return max(1, math.ceil(latency * (len(self._waiters) + 1) / self._capacity()))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "limit": self._capacity(),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "latency_ewma": None if self.latency_ewma is None else round(self.latency_ewma, 4),
+            "target_latency": self.target_latency,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+class AdmissionController:
+    """Agrupa un AdmissionPool por clase de endpoint."""
+
+    def __init__(self, classes: Dict[str, Dict[str, Any]] = ADMISSION_CLASSES):
+        self.pools = {name: AdmissionPool(name, **config) for name, config in classes.items()}
+
+    def pool_for(self, method: str, path: str) -> Optional[AdmissionPool]:
+        endpoint_class = classify_request(method, path)
+        return None if endpoint_class is None else self.pools[endpoint_class]
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.status() for name, pool in self.pools.items()}
+
+admission = AdmissionController()
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI de control de admisión. Si el pool y su cola están llenos responde
+    503 de inmediato, antes de tocar los datos. El lugar se libera y la latencia se mide
+    al enviarse el último fragmento del cuerpo, así las respuestas en streaming
+    cuentan completas (/export tiene su propio pool para no afectar a las lecturas).
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        pool = self.controller.pool_for(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if pool is None:
+            await self.app(scope, receive, send)
+            return
+        if not await pool.acquire():
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Servidor saturado, intente nuevamente más tarde."},
+                headers={"Retry-After": str(pool.retry_after())}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        released = False
+
+        def release(latency: Optional[float]):
+            nonlocal released
+            if not released:
+                released = True
+                pool.release(latency)
+
+        async def send_and_measure(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                release(time.perf_counter() - started)
+
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            release(None)
@@ -0,0 +1,143 @@
+"""
+Registro de cambios de la API Unificada de Premios Nobel
+Numera cada modificación con una revisión creciente, la guarda en un historial acotado
+y la publica a los suscriptores SSE
+"""
+
+import asyncio
+import itertools
+import json
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+SUBSCRIBER_BUFFER = 256
+CHANGELOG_SIZE = 10000
+KEEPALIVE_SECONDS = 15.0
+
+class Subscriber:
+    """Suscriptor del feed con su propio buffer acotado."""
+
+    def __init__(self, buffer_size: int = SUBSCRIBER_BUFFER):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = False
+
+class ChangeFeed:
+    """
+    Cada modificación recibe una revisión y se encola en el buffer de cada suscriptor.
+    Un suscriptor cuyo buffer se llena es desconectado en lugar de frenar al resto;
+    un suscriptor inactivo solo ocupa una cola vacía esperando en el event loop.
+
+    Las últimas `log_size` modificaciones quedan en un historial para /changes?since=N.
+    Las revisiones se reinician con el proceso, por eso cada instancia tiene un `epoch` propio.
+    """
+
+    def __init__(self, buffer_size: int = SUBSCRIBER_BUFFER, log_size: int = CHANGELOG_SIZE):
+        self.revision = 0
+        self.epoch = uuid.uuid4().hex
+        self.log: deque = deque(maxlen=log_size)
+        self.buffer_size = buffer_size
+        self.subscribers: Set[Subscriber] = set()
+        self.dropped_subscribers = 0
+        self.key_revisions: Dict[Tuple[str, str], int] = {}
+
+    def record(self, op: str, year: str, category: str, prize: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Registra una modificación ('insert', 'update' o 'delete') y la publica.
+        Retorna el evento con su revisión.
+        """
+        self.revision += 1
+        event = {
+            "revision": self.revision,
+            "op": op,
+            "year": year,
+            "category": category,
+            "prize": prize,
+        }
+        if op == "delete":
+            self.key_revisions.pop((year, category), None)
+        else:
+            self.key_revisions[(year, category)] = self.revision
+        self.log.append(event)
+        self.publish(event)
+        return event
+
+    def key_revision(self, year: str, category: str) -> int:
+        """Revisión de la última modificación de un premio (0 si no cambió desde la carga)."""
+        return self.key_revisions.get((year, category.lower()), 0)
+
+    def changes_since(self, since: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Retorna las modificaciones con revisión mayor a `since`.
+        Retorna None si parte de ese rango ya fue descartado del historial
+        (o si `since` es posterior a la revisión actual) y hace falta una resincronización completa.
+        """
+        if since > self.revision or since < 0:
+            return None
+        if since == self.revision:
+            return []
+        oldest = self.log[0]["revision"] if self.log else self.revision + 1
+        if since < oldest - 1:
+            return None
+        return list(itertools.islice(self.log, since - oldest + 1, None))
+
+    def publish(self, event: Dict[str, Any]):
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(self.buffer_size)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def _drop(self, subscriber: Subscriber):
+        """Desconecta a un consumidor lento: vacía su buffer y le deja solo la señal de cierre."""
+        self.unsubscribe(subscriber)
+        subscriber.dropped = True
+        self.dropped_subscribers += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Serializa un evento en formato text/event-stream."""
+    data = json.dumps(event, ensure_ascii=False)
+    return f"id: {event['revision']}\nevent: {event['op']}\ndata: {data}\n\n"
+
+def format_resync(feed: ChangeFeed) -> str:
+    """Evento que avisa que los cambios pedidos ya no están en el historial."""
+    data = json.dumps({"revision": feed.revision, "epoch": feed.epoch})
+    return f"id: {feed.revision}\nevent: resync\ndata: {data}\n\n"
+
+async def stream_events(feed: ChangeFeed, subscriber: Subscriber, keepalive: float = KEEPALIVE_SECONDS,
+                        backlog: Optional[List[Dict[str, Any]]] = None, resync: bool = False):
+    """
+    Generador para StreamingResponse. Envía primero `backlog` (reenvío desde Last-Event-ID)
+    o, con `resync`, un evento `resync` para que el cliente recargue el estado completo;
+    luego un comentario de keep-alive cuando no hay cambios, y termina si el suscriptor
+    fue desconectado por lento.
+    """
+    try:
+        yield f": conectado en la revisión {feed.revision}\n\n"
+        if resync:
+            yield format_resync(feed)
+        for event in backlog or []:
+            yield format_sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                yield "event: dropped\ndata: {\"reason\": \"slow consumer\"}\n\n"
+                return
+            yield format_sse(event)
+    finally:
+        feed.unsubscribe(subscriber)
@@ -0,0 +1,60 @@
+"""
+Control de concurrencia de escrituras para la API Unificada de Premios Nobel
+Locks por clave (año, categoría) y ETags basados en la revisión de cada premio
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Hashable, List, Optional
+
+class KeyedLocks:
+    """
+    Un asyncio.Lock por clave, creado a demanda y descartado cuando nadie lo usa.
+    Las escrituras sobre claves distintas no se esperan entre sí.
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, List] = {}
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    @asynccontextmanager
+    async def hold(self, *keys: Hashable):
+        """Toma los locks de todas las claves, siempre en el mismo orden para evitar interbloqueos."""
+        ordered = sorted(set(keys))
+        entries = []
+        for key in ordered:
+            entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+            entry[1] += 1
+            entries.append((key, entry))
+        acquired = []
+        try:
+            for _, entry in entries:
+                await entry[0].acquire()
+                acquired.append(entry[0])
+            yield
+        finally:
+            for lock in acquired:
+                lock.release()
+            for key, entry in entries:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._locks.pop(key, None)
+
+def make_etag(epoch: str, revision: int) -> str:
+    """ETag fuerte de un premio: epoch de la instancia + revisión de su última modificación."""
+    return f'"{epoch}-{revision}"'
+
+def if_match_satisfied(if_match: Optional[str], etag: str) -> bool:
+    """
+    Evalúa el encabezado If-Match contra el ETag actual con comparación fuerte (RFC 7232):
+    un ETag débil (W/) nunca coincide.
+    Sin encabezado la escritura es incondicional; '*' acepta cualquier versión existente.
+    """
+    if if_match is None:
+        return True
+    candidates = [c.strip() for c in if_match.split(",")]
+    if "*" in candidates:
+        return True
+    return etag in candidates
@@ -0,0 +1,117 @@
+"""
+Exportación masiva de premios Nobel como tabla plana premio × laureado
+CSV siempre disponible; Arrow y Parquet solo si pyarrow está instalado
+"""
+
+import csv
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_COLUMNS = [
+    "year", "category", "overallMotivation",
+    "laureate_id", "firstname", "surname", "motivation", "share",
+]
+CHUNK_ROWS = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+def pyarrow_available() -> bool:
+    return pa is not None
+
+def iter_rows(prizes: Iterable[Dict[str, Any]]) -> Iterator[List[Optional[str]]]:
+    """Una fila por laureado; los premios sin laureados generan una fila con esas columnas vacías."""
+    for prize in prizes:
+        head = [prize.get("year"), prize.get("category"), prize.get("overallMotivation")]
+        laureates = prize.get("laureates") or []
+        if not laureates:
+            yield head + [None] * 5
+        for laureate in laureates:
+            yield head + [
+                laureate.get("id"), laureate.get("firstname"), laureate.get("surname"),
+                laureate.get("motivation"), laureate.get("share"),
+            ]
+
+def iter_row_chunks(prizes: Iterable[Dict[str, Any]], chunk_rows: int = CHUNK_ROWS) -> Iterator[List[list]]:
+    chunk = []
+    for row in iter_rows(prizes):
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_csv(prizes: Iterable[Dict[str, Any]], chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """Genera el CSV por bloques de `chunk_rows` filas, con encabezado."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in iter_row_chunks(prizes, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+class _ChunkSink(io.RawIOBase):
+    """Destino de escritura para pyarrow que acumula bytes hasta que se drenan."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _arrow_schema():
+    return pa.schema([(column, pa.string()) for column in EXPORT_COLUMNS])
+
+def _record_batch(chunk: List[list], schema):
+    columns = list(zip(*chunk))
+    return pa.record_batch([pa.array(column, type=pa.string()) for column in columns], schema=schema)
+
+def iter_arrow(prizes: Iterable[Dict[str, Any]], chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """Genera un stream Arrow IPC con un record batch por bloque."""
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for chunk in iter_row_chunks(prizes, chunk_rows):
+            writer.write_batch(_record_batch(chunk, schema))
+            yield sink.drain()
+    yield sink.drain()
+
+def iter_parquet(prizes: Iterable[Dict[str, Any]], chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """Genera un archivo Parquet con un row group por bloque."""
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in iter_row_chunks(prizes, chunk_rows):
+            writer.write_table(pa.Table.from_batches([_record_batch(chunk, schema)]))
+            yield sink.drain()
+    yield sink.drain()
+
+EXPORTERS = {
+    "csv": iter_csv,
+    "arrow": iter_arrow,
+    "parquet": iter_parquet,
+}
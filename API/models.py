@@ -41,4 +41,82 @@ class APIStatus(BaseModel):
     version: str = Field(..., description="Versión de la API")
     total_prizes: int = Field(..., description="Total de premios cargados")
     security_enabled: bool = Field(..., description="Si la seguridad está habilitada")
-    message: str = Field(..., description="Mensaje de bienvenida") 
\ No newline at end of file
+    message: str = Field(..., description="Mensaje de bienvenida") 
+
+class ProfilerStatus(BaseModel):
+    """Modelo para el estado del perfilador por muestreo."""
+    active: bool = Field(..., description="Si el perfilador está muestreando")
+    route: Optional[str] = Field(None, description="Prefijo de ruta perfilado (None = todas)")
+    interval_seconds: float = Field(..., description="Intervalo entre muestras")
+    total_samples: int = Field(..., description="Total de muestras tomadas")
+    requests_profiled: int = Field(..., description="Solicitudes perfiladas")
+    started_at: Optional[float] = Field(None, description="Inicio del perfilado (epoch)")
+    stopped_at: Optional[float] = Field(None, description="Fin del perfilado (epoch)")
+
+class AdmissionPoolStatus(BaseModel):
+    """Estado del pool de admisión de una clase de endpoints."""
+    limit: int = Field(..., description="Solicitudes concurrentes admitidas (límite adaptativo actual)")
+    in_flight: int = Field(..., description="Solicitudes en curso")
+    queued: int = Field(..., description="Solicitudes esperando en la cola")
+    max_queue: int = Field(..., description="Tamaño máximo de la cola")
+    latency_ewma: Optional[float] = Field(None, description="Latencia promedio móvil (segundos)")
+    target_latency: float = Field(..., description="Latencia objetivo (segundos)")
+    admitted: int = Field(..., description="Solicitudes admitidas")
+    rejected: int = Field(..., description="Solicitudes rechazadas con 503")
+
+class LaureatePrize(BaseModel):
+    """Premio recibido por un laureado."""
+    year: str = Field(..., description="Año del premio")
+    category: str = Field(..., description="Categoría del premio")
+    motivation: Optional[str] = Field(None, description="Motivación específica del laureado")
+    share: Optional[str] = Field(None, description="Fracción del premio")
+
+class LaureateDetail(BaseModel):
+    """Modelo para un laureado con todos sus premios."""
+    id: str = Field(..., example="6", description="Identificador del laureado")
+    firstname: Optional[str] = Field(None, example="Marie", description="Nombre del laureado")
+    surname: Optional[str] = Field(None, example="Curie", description="Apellido del laureado")
+    prizes: List[LaureatePrize] = Field(..., description="Premios recibidos")
+
+class LaureatePage(BaseModel):
+    """Modelo para una página de laureados."""
+    total: int = Field(..., description="Total de laureados indexados")
+    offset: int = Field(..., description="Desplazamiento de la página")
+    limit: int = Field(..., description="Tamaño de la página")
+    items: List[LaureateDetail] = Field(..., description="Laureados de la página")
+
+class SyncResult(BaseModel):
+    """Modelo para el resultado de una sincronización incremental."""
+    added: int = Field(..., description="Premios nuevos")
+    updated: int = Field(..., description="Premios modificados")
+    removed: int = Field(..., description="Premios eliminados")
+
+class ChangeEvent(BaseModel):
+    """Modelo para una modificación registrada en el historial de cambios."""
+    revision: int = Field(..., description="Revisión de la modificación")
+    op: str = Field(..., example="update", description="insert, update o delete")
+    year: str = Field(..., description="Año del premio")
+    category: str = Field(..., description="Categoría del premio (minúsculas)")
+    prize: Optional[PrizeBase] = Field(None, description="Premio resultante (None en las bajas)")
+
+class ChangesResponse(BaseModel):
+    """Modelo para la respuesta de /changes."""
+    epoch: str = Field(..., description="Identificador de la instancia; si cambia, hace falta resincronizar")
+    revision: int = Field(..., description="Revisión actual del servidor")
+    resync_required: bool = Field(..., description="True si el historial ya no cubre la revisión pedida")
+    changes: List[ChangeEvent] = Field(..., description="Modificaciones posteriores a la revisión pedida")
+
+class HealthStatus(BaseModel):
+    """Modelo para la prueba de liveness."""
+    status: str = Field(..., description="Siempre 'alive' si el proceso responde")
+    uptime_seconds: float = Field(..., description="Segundos desde el inicio")
+
+class ReadinessStatus(BaseModel):
+    """Modelo para la prueba de readiness."""
+    ready: bool = Field(..., description="Si los datos y los índices están cargados")
+    phase: str = Field(..., description="starting, downloading, loading, error (esperando reintento) o ready")
+    started_at: Optional[float] = Field(None, description="Inicio del proceso (epoch)")
+    load_seconds: Optional[float] = Field(None, description="Duración total de la carga inicial")
+    download_seconds: Optional[float] = Field(None, description="Duración de la descarga inicial, si hubo")
+    error: Optional[str] = Field(None, description="Último error de la carga inicial")
+    total_prizes: int = Field(..., description="Premios cargados")
@@ -0,0 +1,230 @@
+"""
+Índices en memoria para consultas por rango, múltiples criterios y laureados
+Índice ordenado por año (entero), uno por categoría e índice inverso por id de laureado
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+def parse_year(year: Any) -> Optional[int]:
+    """Convierte el año (almacenado como cadena) a entero. Retorna None si no es numérico."""
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return None
+
+def laureate_sort_key(laureate_id: str) -> Tuple[int, Any]:
+    """Ordena primero los ids numéricos (de la API oficial) y luego los sintéticos."""
+    try:
+        return 0, int(laureate_id)
+    except ValueError:
+        return 1, laureate_id
+
+class SortedEntries:
+    """
+    Lista ordenada que admite cargas masivas: las altas se acumulan en un buffer y se
+    incorporan en la siguiente lectura o baja. Pocas altas se insertan en orden
+    (bisect); muchas se agregan al final y la lista se reordena una sola vez.
+    Así indexar N premios al cargar cuesta O(N log N) y no O(N²).
+    """
+
+    def __init__(self):
+        self._items: list = []
+        self._pending: list = []
+
+    def __len__(self) -> int:
+        return len(self._items) + len(self._pending)
+
+    def add(self, entry):
+        self._pending.append(entry)
+
+    def remove(self, entry) -> bool:
+        items = self.items()
+        i = bisect_left(items, entry)
+        if i < len(items) and items[i] == entry:
+            del items[i]
+            return True
+        return False
+
+    def items(self) -> list:
+        if self._pending:
+            if len(self._pending) * 8 < len(self._items):
+                for entry in self._pending:
+                    insort(self._items, entry)
+            else:
+                self._items.extend(self._pending)
+                self._items.sort()
+            self._pending.clear()
+        return self._items
+
+class PrizeIndex:
+    """
+    Cada premio indexado ocupa un "slot" (posición estable). Hay una lista ordenada
+    de (año, slot) con todos los premios y otra por categoría, de modo que un rango
+    de años cuesta O(log N + k), donde k son los premios de las categorías pedidas
+    dentro del rango. Los premios con motivación general son un conjunto de slots.
+
+    Además mantiene un índice inverso id de laureado -> slots de sus premios y otro
+    (año, categoría) -> slots, para encontrar un premio por su clave en O(1).
+    """
+
+    def __init__(self):
+        self._slots: List[Optional[Dict[str, Any]]] = []
+        self._free_slots: List[int] = []
+        self._slot_of: Dict[int, int] = {}
+        self._slot_meta: Dict[int, Tuple[Optional[int], str, Tuple[str, ...], Tuple[str, str]]] = {}
+        self._key_slots: Dict[Tuple[str, str], Dict[int, None]] = {}
+        self._years = SortedEntries()
+        self._category_years: Dict[str, SortedEntries] = {}
+        self._motivation_slots: set = set()
+        self._laureate_slots: Dict[str, Dict[int, None]] = {}
+        self._laureate_order = SortedEntries()
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def add(self, prize: Dict[str, Any]):
+        """Indexa un premio. El premio se identifica por objeto, no por contenido."""
+        if id(prize) in self._slot_of:
+            self.remove(prize)
+        slot = self._free_slots.pop() if self._free_slots else len(self._slots)
+        if slot == len(self._slots):
+            self._slots.append(prize)
+        else:
+            self._slots[slot] = prize
+        self._slot_of[id(prize)] = slot
+
+        year = parse_year(prize.get("year"))
+        category = str(prize.get("category") or "").lower()
+        key = (str(prize.get("year") or ""), category)
+        laureate_ids = tuple(l["id"] for l in prize.get("laureates") or [] if l.get("id"))
+        self._slot_meta[slot] = (year, category, laureate_ids, key)
+        self._key_slots.setdefault(key, {})[slot] = None
+        for laureate_id in laureate_ids:
+            slots = self._laureate_slots.get(laureate_id)
+            if slots is None:
+                slots = self._laureate_slots[laureate_id] = {}
+                self._laureate_order.add((laureate_sort_key(laureate_id), laureate_id))
+            slots[slot] = None
+        if year is not None:
+            self._years.add((year, slot))
+            self._category_years.setdefault(category, SortedEntries()).add((year, slot))
+        if prize.get("overallMotivation"):
+            self._motivation_slots.add(slot)
+
+    def remove(self, prize: Dict[str, Any]):
+        """Quita un premio del índice. Usa los valores con que fue indexado."""
+        slot = self._slot_of.pop(id(prize), None)
+        if slot is None:
+            return
+        year, category, laureate_ids, key = self._slot_meta.pop(slot)
+        key_slots = self._key_slots[key]
+        del key_slots[slot]
+        if not key_slots:
+            del self._key_slots[key]
+        for laureate_id in laureate_ids:
+            slots = self._laureate_slots.get(laureate_id)
+            if slots is None:
+                continue
+            slots.pop(slot, None)
+            if not slots:
+                del self._laureate_slots[laureate_id]
+                self._laureate_order.remove((laureate_sort_key(laureate_id), laureate_id))
+        if year is not None:
+            self._years.remove((year, slot))
+            entries = self._category_years.get(category)
+            if entries is not None:
+                entries.remove((year, slot))
+                if not entries:
+                    del self._category_years[category]
+        self._motivation_slots.discard(slot)
+        self._slots[slot] = None
+        self._free_slots.append(slot)
+
+    def find(self, year: str, category: str) -> List[Dict[str, Any]]:
+        """Retorna los premios con ese año y categoría (sin distinguir mayúsculas)."""
+        return [self._slots[slot] for slot in self._key_slots.get((year, category.lower()), ())]
+
+    def _year_range(self, entries: SortedEntries, year_from: Optional[int], year_to: Optional[int],
+                    descending: bool) -> Iterator[Tuple[int, int]]:
+        items = entries.items()
+        lo = 0 if year_from is None else bisect_left(items, (year_from, -1))
+        hi = len(items) if year_to is None else bisect_right(items, (year_to, len(self._slots)))
+        positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        return (items[i] for i in positions)
+
+    def query(
+        self,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        categories: Optional[List[str]] = None,
+        has_motivation: Optional[bool] = None,
+        min_laureates: Optional[int] = None,
+        max_laureates: Optional[int] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retorna los premios que cumplen todos los criterios, ordenados por año.
+        Los premios con año no numérico no participan de las consultas por rango.
+        """
+        if categories:
+            lists = [self._category_years[c] for c in {c.lower() for c in categories} if c in self._category_years]
+            if not lists:
+                return []
+            ranges = [self._year_range(entries, year_from, year_to, descending) for entries in lists]
+            candidates = ranges[0] if len(ranges) == 1 else heapq.merge(*ranges, reverse=descending)
+        else:
+            candidates = self._year_range(self._years, year_from, year_to, descending)
+
+        results = []
+        for _, slot in candidates:
+            if has_motivation is not None and (slot in self._motivation_slots) != has_motivation:
+                continue
+            prize = self._slots[slot]
+            if min_laureates is not None or max_laureates is not None:
+                count = len(prize.get("laureates") or [])
+                if min_laureates is not None and count < min_laureates:
+                    continue
+                if max_laureates is not None and count > max_laureates:
+                    continue
+            results.append(prize)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def laureate_count(self) -> int:
+        return len(self._laureate_order)
+
+    def laureate_ids(self, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """Retorna una página de ids de laureados en orden estable."""
+        end = None if limit is None else offset + limit
+        return [laureate_id for _, laureate_id in self._laureate_order.items()[offset:end]]
+
+    def laureate_details(self, laureate_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna los datos de un laureado junto con todos sus premios, ordenados por año.
+        Retorna None si el id no está indexado.
+        """
+        slots = self._laureate_slots.get(laureate_id)
+        if not slots:
+            return None
+        prizes = sorted(
+            (self._slots[slot] for slot in slots),
+            key=lambda p: (parse_year(p.get("year")) or 0, p.get("category", ""))
+        )
+        details: Dict[str, Any] = {"id": laureate_id, "prizes": []}
+        for prize in prizes:
+            for laureate in prize.get("laureates") or []:
+                if laureate.get("id") != laureate_id:
+                    continue
+                details["firstname"] = laureate.get("firstname")
+                details["surname"] = laureate.get("surname")
+                details["prizes"].append({
+                    "year": prize.get("year"),
+                    "category": prize.get("category"),
+                    "motivation": laureate.get("motivation"),
+                    "share": laureate.get("share"),
+                })
+        return details
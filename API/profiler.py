@@ -0,0 +1,163 @@
+"""
+Perfilador por muestreo para la API Unificada de Premios Nobel
+Genera volcados de pilas colapsadas compatibles con flamegraph
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+SAMPLE_INTERVAL = 0.005
+MAX_STACK_DEPTH = 64
+
+class SamplingProfiler:
+    """
+    Perfilador estadístico que muestrea periódicamente la pila del hilo del
+    event loop mientras hay solicitudes perfiladas en curso.
+
+    Cuando está inactivo el único costo es la lectura del atributo `active`
+    en el middleware, por lo que puede quedar siempre habilitado.
+
+    El filtro `route` solo decide cuándo se muestrea: mientras haya alguna solicitud
+    de esa ruta en curso se muestrea todo el hilo del event loop, por lo que otras
+    solicitudes concurrentes también aparecen en el volcado.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.active = False
+        self.route: Optional[str] = None
+        self.samples: Counter = Counter()
+        self.total_samples = 0
+        self.requests_profiled = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self._max_requests: Optional[int] = None
+        self._deadline: Optional[float] = None
+        self._target_thread: Optional[int] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._generation = 0
+
+    def start(self, seconds: Optional[float] = None, max_requests: Optional[int] = None,
+              route: Optional[str] = None) -> bool:
+        """
+        Inicia el muestreo sobre el hilo actual (el del event loop).
+        Se detiene solo al cumplirse `seconds` o `max_requests`, lo que ocurra primero.
+        Retorna False si ya había un perfilado en curso.
+        """
+        with self._lock:
+            if self.active:
+                return False
+            self.samples = Counter()
+            self.total_samples = 0
+            self.requests_profiled = 0
+            self.route = route
+            self._max_requests = max_requests
+            self._deadline = time.monotonic() + seconds if seconds else None
+            self._target_thread = threading.get_ident()
+            self._in_flight = 0
+            self.started_at = time.time()
+            self.stopped_at = None
+            self.active = True
+            self._generation += 1
+            generation = self._generation
+        self._thread = threading.Thread(target=self._run, args=(generation,), name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Detiene el muestreo si está activo."""
+        with self._lock:
+            if not self.active:
+                return
+            self.active = False
+            self.stopped_at = time.time()
+
+    def matches(self, path: str) -> bool:
+        """Indica si una ruta activa el muestreo según el filtro configurado."""
+        return self.route is None or path.startswith(self.route)
+
+    def request_started(self) -> int:
+        """Registra una solicitud perfilada y retorna la sesión a la que pertenece."""
+        with self._lock:
+            self._in_flight += 1
+            return self._generation
+
+    def request_finished(self, generation: int):
+        """Cuenta la solicitud solo si la sesión en que empezó sigue siendo la actual."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._in_flight = max(0, self._in_flight - 1)
+            self.requests_profiled += 1
+            if self._max_requests is not None and self.requests_profiled >= self._max_requests:
+                self.active = False
+                self.stopped_at = time.time()
+
+    def _run(self, generation: int):
+        """Muestrea hasta que termine su sesión; un hilo de una sesión anterior sale sin muestrear."""
+        while self.active and self._generation == generation:
+            if self._deadline is not None and time.monotonic() >= self._deadline:
+                with self._lock:
+                    if self._generation == generation:
+                        self.active = False
+                        self.stopped_at = time.time()
+                break
+            if self._in_flight > 0:
+                frame = sys._current_frames().get(self._target_thread)
+                if frame is not None:
+                    self._record(frame)
+            time.sleep(self.interval)
+
+    def _record(self, frame):
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.reverse()
+        self.samples[";".join(stack)] += 1
+        self.total_samples += 1
+
+    def collapsed(self) -> str:
+        """Retorna las muestras en formato de pilas colapsadas (una por línea con su conteo)."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common()) + "\n"
+
+    def status(self) -> dict:
+        """Retorna el estado actual del perfilador."""
+        return {
+            "active": self.active,
+            "route": self.route,
+            "interval_seconds": self.interval,
+            "total_samples": self.total_samples,
+            "requests_profiled": self.requests_profiled,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+        }
+
+profiler = SamplingProfiler()
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que marca las solicitudes perfiladas. Con el perfilador apagado
+    solo consulta `profiler.active` y llama directamente a la aplicación.
+    """
+
+    def __init__(self, app, sampler: SamplingProfiler = profiler):
+        self.app = app
+        self.sampler = sampler
+
+    async def __call__(self, scope, receive, send):
+        if not self.sampler.active or scope["type"] != "http" or not self.sampler.matches(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        generation = self.sampler.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.sampler.request_finished(generation)
@@ -4,10 +4,14 @@ Combina todas las funcionalidades de las Etapas 2, 3 y 4
 Incluye consultas, modificaciones, autenticación y rate limiting
 """
 
-from fastapi import FastAPI, HTTPException, status, Depends, Request
+from fastapi import FastAPI, HTTPException, status, Depends, Request, Query, Response, Header
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from typing import List, Optional, Dict, Any
+import asyncio
+import copy
 import json
 import os
+import time
 import uvicorn
 import sys
 import os
@@ -15,11 +19,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from Etapa1 import data_handler
 from models import (
     PrizeBase, LaureateBase, PrizeCreate, PrizeUpdate, 
-    SecurityInfo, APIStatus
+    SecurityInfo, APIStatus, ProfilerStatus, AdmissionPoolStatus, LaureateDetail, LaureatePage,
+    SyncResult, ChangesResponse, HealthStatus, ReadinessStatus
 )
+from stats import PrizeStats
+from prize_index import PrizeIndex
+from storage import StorageBackend, JSONStorage, SQLiteStorage, file_signature
+from changes import ChangeFeed, stream_events
+from export import EXPORTERS, EXPORT_MEDIA_TYPES, pyarrow_available
+from concurrency import KeyedLocks, make_etag, if_match_satisfied
 from security_config import (
     get_current_user, require_admin, limiter, RATE_LIMITS
 )
+from profiler import profiler, ProfilingMiddleware
+from admission import admission, AdmissionMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -34,39 +47,337 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 NOBEL_PRIZES_DATA: List[Dict[str, Any]] = []
 LOCAL_JSON_FILE = "nobel_prizes.json"
+PRIZE_STATS = PrizeStats()
+PRIZE_INDEX = PrizeIndex()
+CHANGE_FEED = ChangeFeed()
+WRITE_LOCKS = KeyedLocks()
+STORAGE_BACKEND = os.environ.get("NOBEL_STORAGE", "json").lower()
+SQLITE_FILE = os.environ.get("NOBEL_SQLITE_FILE", "nobel_prizes.db")
+SYNC_URL = os.environ.get("NOBEL_SYNC_URL", data_handler.NOBEL_PRIZES_URL)
+SYNC_INTERVAL = float(os.environ.get("NOBEL_SYNC_INTERVAL", "0"))
+SYNC_REMOVE_MISSING = os.environ.get("NOBEL_SYNC_REMOVE_MISSING", "false").lower() in ("1", "true", "yes")
+STARTUP_RETRY_SECONDS = float(os.environ.get("NOBEL_STARTUP_RETRY", "30"))
+RELOAD_WATCH_INTERVAL = float(os.environ.get("NOBEL_RELOAD_WATCH", "0"))
+STARTUP_STATE: Dict[str, Any] = {
+    "ready": False,
+    "phase": "starting",
+    "started_at": None,
+    "load_seconds": None,
+    "download_seconds": None,
+    "error": None,
+}
+BACKGROUND_TASKS = set()
+
+def create_storage() -> StorageBackend:
+    """Crea el backend configurado en NOBEL_STORAGE ('json' por defecto o 'sqlite')."""
+    if STORAGE_BACKEND == "sqlite":
+        return SQLiteStorage(SQLITE_FILE, import_from=LOCAL_JSON_FILE)
+    return JSONStorage(LOCAL_JSON_FILE, lambda: NOBEL_PRIZES_DATA)
+
+STORAGE = create_storage()
+
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(AdmissionMiddleware)
+
+def start_background_task(coro):
+    """Crea una tarea en segundo plano conservando una referencia hasta que termine."""
+    task = asyncio.create_task(coro)
+    BACKGROUND_TASKS.add(task)
+    task.add_done_callback(BACKGROUND_TASKS.discard)
+    return task
 
 @app.on_event("startup")
 async def startup_event():
-    """Función que se ejecuta al iniciar la aplicación FastAPI."""
-    global NOBEL_PRIZES_DATA
+    """
+    Función que se ejecuta al iniciar la aplicación FastAPI.
+    No espera a los datos: la carga corre en segundo plano y /readyz indica cuándo terminó.
+    """
     print("🚀 Iniciando API Unificada de Premios Nobel...")
-    print("📊 Cargando datos de premios Nobel...")
-    
-    if not os.path.exists(LOCAL_JSON_FILE):
-        print(f"📥 El archivo '{LOCAL_JSON_FILE}' no se encontró. Descargando...")
-        if not data_handler.download_nobel_prizes_data():
-            print("❌ ERROR: No se pudieron descargar los datos. La API funcionará sin datos.")
-            NOBEL_PRIZES_DATA = []
-            return
-
-    NOBEL_PRIZES_DATA = data_handler.load_nobel_prizes_data()
-    if not NOBEL_PRIZES_DATA:
-        print("⚠️ ADVERTENCIA: Se cargó una lista vacía de premios.")
-    else:
-        print(f"✅ Se cargaron {len(NOBEL_PRIZES_DATA)} premios Nobel exitosamente.")
+    STARTUP_STATE["started_at"] = time.time()
+    start_background_task(load_initial_data())
+    if SYNC_INTERVAL > 0:
+        start_background_task(periodic_sync())
+    if RELOAD_WATCH_INTERVAL > 0:
+        start_background_task(watch_data_file())
     print("🔐 Seguridad habilitada: Autenticación Basic + Rate Limiting")
-    print("🌐 API lista en: http://localhost:8001")
-
-def save_nobel_prizes_data_to_file():
-    """Guarda el estado actual de NOBEL_PRIZES_DATA en el archivo JSON local."""
-    try:
-        data_to_save = {"prizes": NOBEL_PRIZES_DATA}
-        with open(LOCAL_JSON_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data_to_save, f, ensure_ascii=False, indent=4)
-        return True
-    except IOError as e:
-        print(f"❌ ERROR: No se pudo guardar los datos: {e}")
-        return False
+    print("🌐 API escuchando en: http://localhost:8001 (ver /readyz)")
+
+async def load_initial_data():
+    """
+    Carga e indexa los datos en un hilo aparte. Si no hay datos, los descarga.
+    Si la carga o la descarga fallan, el error queda en /readyz y se reintenta
+    cada NOBEL_STARTUP_RETRY segundos hasta lograrlo.
+    """
+    global NOBEL_PRIZES_DATA, PRIZE_STATS, PRIZE_INDEX
+    load_started = time.perf_counter()
+    while True:
+        try:
+            if STORAGE.exists():
+                STARTUP_STATE["phase"] = "loading"
+                print("📊 Cargando datos de premios Nobel...")
+                NOBEL_PRIZES_DATA, PRIZE_STATS, PRIZE_INDEX = await asyncio.to_thread(load_store, STORAGE)
+                if not NOBEL_PRIZES_DATA:
+                    print("⚠️ ADVERTENCIA: Se cargó una lista vacía de premios.")
+                break
+
+            STARTUP_STATE["phase"] = "downloading"
+            print(f"📥 No hay datos en el almacenamiento ({STORAGE_BACKEND}). Descargando...")
+            download_started = time.perf_counter()
+            result = await run_sync()
+            STARTUP_STATE["download_seconds"] = round(time.perf_counter() - download_started, 3)
+            if result is not None:
+                break
+            error = "No se pudieron descargar los datos desde la fuente oficial."
+        except Exception as e:
+            error = f"Error al cargar los datos: {type(e).__name__}: {e}"
+        STARTUP_STATE["error"] = error
+        STARTUP_STATE["phase"] = "error"
+        print(f"❌ ERROR: {error} Reintentando en {STARTUP_RETRY_SECONDS:g} segundos...")
+        await asyncio.sleep(STARTUP_RETRY_SECONDS)
+
+    STARTUP_STATE["load_seconds"] = round(time.perf_counter() - load_started, 3)
+    STARTUP_STATE["error"] = None
+    STARTUP_STATE["phase"] = "ready"
+    STARTUP_STATE["ready"] = True
+    print(f"✅ Se cargaron {len(NOBEL_PRIZES_DATA)} premios Nobel en {STARTUP_STATE['load_seconds']} s.")
+
+def ensure_ready():
+    """Rechaza con 503 las modificaciones mientras la carga inicial no terminó."""
+    if not STARTUP_STATE["ready"]:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="La API todavía está cargando los datos.",
+            headers={"Retry-After": "5"}
+        )
+
+def load_store(storage: StorageBackend):
+    """
+    Carga los premios desde el backend e indexa cada uno a medida que se lee.
+    Retorna (premios, agregados, índice) sin tocar el estado global.
+    """
+    stats = PrizeStats()
+    index = PrizeIndex()
+    last_quarter = 0
+
+    def index_loaded_prize(prize: Dict[str, Any]):
+        stats.add(prize)
+        index.add(prize)
+
+    def report_progress(bytes_read: int, total_bytes: int, prizes_loaded: int):
+        nonlocal last_quarter
+        quarter = bytes_read * 4 // max(total_bytes, 1)
+        if quarter > last_quarter:
+            last_quarter = quarter
+            print(f"   ⏳ {bytes_read * 100 // max(total_bytes, 1)}% leído, {prizes_loaded} premios cargados")
+
+    prizes = storage.load_prizes(on_prize=index_loaded_prize, progress=report_progress)
+    if not prizes:
+        return [], PrizeStats(), PrizeIndex()
+    return prizes, stats, index
+
+def index_prize(prize: Dict[str, Any]):
+    """Incorpora un premio nuevo o modificado a los índices y agregados."""
+    PRIZE_STATS.add(prize)
+    PRIZE_INDEX.add(prize)
+
+def unindex_prize(prize: Dict[str, Any]):
+    """Quita un premio de los índices y agregados. Debe llamarse antes de modificarlo."""
+    PRIZE_STATS.remove(prize)
+    PRIZE_INDEX.remove(prize)
+
+def record_change(op: str, prize: Dict[str, Any]):
+    """Registra la modificación en el feed de cambios con una copia del premio."""
+    year, category = data_handler.prize_key(prize)
+    CHANGE_FEED.record(op, year, category, None if op == "delete" else copy.deepcopy(prize))
+
+def insert_prize(prize: Dict[str, Any]):
+    """Agrega un premio al almacén en memoria y a los índices."""
+    NOBEL_PRIZES_DATA.append(prize)
+    index_prize(prize)
+    record_change("insert", prize)
+
+def replace_prize(existing_prize: Dict[str, Any], new_data: Dict[str, Any]):
+    """Reemplaza el contenido de un premio existente manteniendo su identidad."""
+    old_key = data_handler.prize_key(existing_prize)
+    unindex_prize(existing_prize)
+    existing_prize.clear()
+    existing_prize.update(new_data)
+    index_prize(existing_prize)
+    if data_handler.prize_key(existing_prize) == old_key:
+        record_change("update", existing_prize)
+    else:
+        CHANGE_FEED.record("delete", old_key[0], old_key[1])
+        record_change("insert", existing_prize)
+
+def remove_prizes(prizes: List[Dict[str, Any]]):
+    """Quita premios del almacén en memoria y de los índices."""
+    global NOBEL_PRIZES_DATA
+    removed_ids = {id(p) for p in prizes}
+    NOBEL_PRIZES_DATA = [p for p in NOBEL_PRIZES_DATA if id(p) not in removed_ids]
+    for prize in prizes:
+        unindex_prize(prize)
+        record_change("delete", prize)
+
+def diff_keys(diff: Dict[str, List[Dict[str, Any]]]) -> set:
+    return {data_handler.prize_key(p) for prizes in diff.values() for p in prizes}
+
+async def apply_incoming_prizes(incoming: List[Dict[str, Any]], persist: bool = True,
+                                remove_missing: bool = False) -> Dict[str, int]:
+    """
+    Aplica solo las diferencias entre `incoming` y el estado actual, mediante las mismas
+    funciones de modificación que usan los endpoints y con los locks de las claves afectadas.
+    Todas las diferencias se aplican sin ceder el event loop, así que ninguna solicitud ve
+    un estado a medias. Solo persiste si hubo cambios y `persist` es verdadero.
+    Los premios que no están en `incoming` solo se eliminan si `remove_missing` es verdadero.
+    Si la escritura falla se deshacen todas las diferencias (ver commit_changes).
+    """
+    while True:
+        keys = diff_keys(data_handler.diff_prizes(NOBEL_PRIZES_DATA, incoming, remove_missing))
+        async with WRITE_LOCKS.hold(*keys):
+            diff = data_handler.diff_prizes(NOBEL_PRIZES_DATA, incoming, remove_missing)
+            if not diff_keys(diff) <= keys:
+                continue
+            current_by_key = {data_handler.prize_key(p): p for p in NOBEL_PRIZES_DATA}
+            replaced = []
+            for prize in diff["added"]:
+                insert_prize(prize)
+            for prize in diff["updated"]:
+                existing_prize = current_by_key[data_handler.prize_key(prize)]
+                replaced.append((existing_prize, dict(existing_prize)))
+                replace_prize(existing_prize, prize)
+            remove_prizes(diff["removed"])
+
+            result = {change: len(prizes) for change, prizes in diff.items()}
+            if persist and any(result.values()):
+                await commit_changes(added=diff["added"], replaced=replaced, removed=diff["removed"])
+            return result
+
+async def run_sync(remove_missing: bool = SYNC_REMOVE_MISSING) -> Optional[Dict[str, int]]:
+    """
+    Descarga la versión publicada en un hilo aparte y aplica solo los premios que cambiaron.
+    Los premios que ya no están publicados (por ejemplo, los creados con POST /prizes)
+    se conservan salvo que `remove_missing` sea verdadero.
+    Retorna None si la descarga falló.
+    """
+    incoming = await asyncio.to_thread(data_handler.fetch_nobel_prizes_stream, SYNC_URL)
+    if incoming is None:
+        print("❌ ERROR: Falló la sincronización con la fuente de datos.")
+        return None
+    result = await apply_incoming_prizes(incoming, remove_missing=remove_missing)
+    print(f"🔄 Sincronización: {result['added']} nuevos, {result['updated']} actualizados, {result['removed']} eliminados.")
+    return result
+
+async def periodic_sync():
+    """
+    Sincroniza cada NOBEL_SYNC_INTERVAL segundos, una vez terminada la carga inicial.
+    Un error en una sincronización se registra y no detiene las siguientes.
+    """
+    while True:
+        await asyncio.sleep(SYNC_INTERVAL)
+        if not STARTUP_STATE["ready"]:
+            continue
+        try:
+            await run_sync()
+        except Exception as e:
+            print(f"❌ ERROR: Falló la sincronización automática: {type(e).__name__}: {e}")
+
+async def reload_data_file(signature: Optional[tuple] = None) -> Optional[Dict[str, int]]:
+    """
+    Vuelve a leer nobel_prizes.json en un hilo aparte y aplica solo los premios que cambiaron.
+    Los premios sin cambios conservan su revisión (y su ETag). Si el archivo es el último
+    que escribió la propia API no hay nada que aplicar.
+    Retorna None si el archivo no existe, no es válido o no contiene premios.
+    """
+    signature = signature or file_signature(LOCAL_JSON_FILE)
+    if signature is None:
+        return None
+    if STORAGE.is_own_write(signature):
+        return {"added": 0, "updated": 0, "removed": 0}
+    incoming = await asyncio.to_thread(data_handler.load_nobel_prizes_data, LOCAL_JSON_FILE)
+    if not incoming:
+        return None
+    # Con JSONStorage el archivo recargado ya es el almacenamiento: no hace falta reescribirlo.
+    result = await apply_incoming_prizes(incoming, persist=not isinstance(STORAGE, JSONStorage), remove_missing=True)
+    print(f"🔁 Recarga de '{LOCAL_JSON_FILE}': {result['added']} nuevos, {result['updated']} actualizados, {result['removed']} eliminados.")
+    return result
+
+async def watch_data_file():
+    """
+    Revisa cada NOBEL_RELOAD_WATCH segundos si nobel_prizes.json cambió (mtime y tamaño)
+    y lo recarga cuando su firma se mantiene igual durante dos revisiones seguidas,
+    para no leer un archivo que todavía se está copiando. Un error en una recarga
+    se registra y no detiene la vigilancia.
+    """
+    last_seen = file_signature(LOCAL_JSON_FILE)
+    pending = None
+    while True:
+        await asyncio.sleep(RELOAD_WATCH_INTERVAL)
+        signature = file_signature(LOCAL_JSON_FILE)
+        if signature is None or signature == last_seen:
+            pending = None
+            continue
+        if not STARTUP_STATE["ready"]:
+            last_seen, pending = signature, None
+            continue
+        if signature != pending:
+            pending = signature
+            continue
+        pending = None
+        last_seen = signature
+        try:
+            result = await reload_data_file(signature)
+        except Exception as e:
+            print(f"❌ ERROR: Falló la recarga de '{LOCAL_JSON_FILE}': {type(e).__name__}: {e}")
+            continue
+        if result is None:
+            print(f"⚠️ ADVERTENCIA: '{LOCAL_JSON_FILE}' cambió pero no es válido; se mantienen los datos actuales.")
+
+async def save_changes(upserted: List[Dict[str, Any]] = (), removed_keys: List[tuple] = ()) -> bool:
+    """
+    Persiste una modificación en el backend configurado. La copia de los datos se toma
+    en el event loop y la escritura corre en un hilo, para que las escrituras sobre
+    otras claves puedan avanzar mientras tanto.
+    """
+    write = STORAGE.prepare_persist(NOBEL_PRIZES_DATA, upserted=upserted, removed_keys=removed_keys)
+    return await asyncio.to_thread(write)
+
+async def commit_changes(added: List[Dict[str, Any]] = (), replaced: List[tuple] = (),
+                         removed: List[Dict[str, Any]] = ()):
+    """
+    Persiste cambios ya aplicados en memoria: `added` son premios insertados, `replaced`
+    pares (premio, copia previa) y `removed` premios eliminados. Si la escritura falla,
+    deshace los cambios en memoria (publicando los eventos inversos en el feed) y responde
+    500, para que la memoria y el backend no queden distintos. Se llama con los locks
+    de las claves afectadas tomados.
+    """
+    removed_keys = [data_handler.prize_key(p) for p in removed]
+    removed_keys += [
+        data_handler.prize_key(previous) for prize, previous in replaced
+        if data_handler.prize_key(previous) != data_handler.prize_key(prize)
+    ]
+    upserted = list(added) + [prize for prize, _ in replaced]
+    if await save_changes(upserted=upserted, removed_keys=removed_keys):
+        return
+
+    remove_prizes(list(added))
+    for prize, previous in replaced:
+        replace_prize(prize, previous)
+    for prize in removed:
+        insert_prize(prize)
+    print("❌ ERROR: No se pudieron guardar los cambios; se descartaron en memoria.")
+    raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="No se pudieron guardar los cambios; la modificación se descartó."
+    )
+
+def find_prize(year: str, category: str) -> Optional[Dict[str, Any]]:
+    """Busca un premio por año y categoría en el índice en memoria."""
+    matches = PRIZE_INDEX.find(year, category)
+    return matches[0] if matches else None
+
+def prize_etag(prize: Dict[str, Any]) -> str:
+    """ETag del estado actual de un premio."""
+    return make_etag(CHANGE_FEED.epoch, CHANGE_FEED.key_revision(*data_handler.prize_key(prize)))
 
 # --- Endpoints de Información y Estado ---
 
@@ -85,6 +396,24 @@ async def read_root(request: Request):
         message="¡Bienvenido a la API Unificada de Premios Nobel! Accede a /docs para ver la documentación completa."
     )
 
+@app.get("/healthz", response_model=HealthStatus, tags=["Información"])
+async def liveness_probe():
+    """
+    Liveness: responde mientras el proceso y el event loop estén vivos, aunque los datos no estén cargados.
+    """
+    return HealthStatus(status="alive", uptime_seconds=round(time.time() - (STARTUP_STATE["started_at"] or time.time()), 3))
+
+@app.get("/readyz", response_model=ReadinessStatus, tags=["Información"])
+async def readiness_probe(response: Response):
+    """
+    Readiness: 200 cuando los datos y los índices están cargados, 503 mientras tanto.
+    Incluye la duración de la carga y de la descarga inicial.
+    """
+    if not STARTUP_STATE["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        response.headers["Retry-After"] = "5"
+    return ReadinessStatus(total_prizes=len(NOBEL_PRIZES_DATA), **STARTUP_STATE)
+
 @app.get("/security/info", response_model=SecurityInfo, tags=["Seguridad"])
 @limiter.limit(RATE_LIMITS["default"])
 async def get_security_info(request: Request):
@@ -95,12 +424,21 @@ async def get_security_info(request: Request):
         authentication="HTTP Basic Authentication",
         rate_limits=RATE_LIMITS,
         protected_endpoints={
-            "POST": ["/prizes"],
+            "GET": ["/admin/profiler", "/admin/admission"],
+            "POST": ["/prizes", "/admin/sync", "/admin/reload", "/admin/profiler"],
             "PUT": ["/prizes/{year}/{category}"],
-            "DELETE": ["/prizes/{year}/{category}"]
+            "DELETE": ["/prizes/{year}/{category}", "/admin/profiler"]
         },
-        admin_only=["DELETE /prizes/{year}/{category}"],
-        message="Los endpoints POST, PUT y DELETE requieren autenticación. DELETE requiere permisos de administrador."
+        admin_only=[
+            "DELETE /prizes/{year}/{category}",
+            "POST /admin/sync",
+            "POST /admin/reload",
+            "POST /admin/profiler",
+            "GET /admin/profiler",
+            "DELETE /admin/profiler",
+            "GET /admin/admission"
+        ],
+        message="Los endpoints POST, PUT y DELETE requieren autenticación. DELETE y /admin requieren permisos de administrador."
     )
 
 # --- Endpoints de Consulta (GET) - Sin autenticación ---
@@ -118,13 +456,46 @@ async def get_all_nobel_prizes(request: Request):
         )
     return NOBEL_PRIZES_DATA
 
+@app.get("/prizes/query", response_model=List[PrizeBase], tags=["Consultas"])
+@limiter.limit(RATE_LIMITS["default"])
+async def query_prizes(
+    request: Request,
+    year_from: Optional[int] = Query(None, alias="from", description="Año inicial (inclusive)"),
+    year_to: Optional[int] = Query(None, alias="to", description="Año final (inclusive)"),
+    category: Optional[List[str]] = Query(None, description="Una o más categorías"),
+    has_motivation: Optional[bool] = Query(None, description="Filtrar por presencia de overallMotivation"),
+    min_laureates: Optional[int] = Query(None, ge=0, description="Cantidad mínima de laureados"),
+    max_laureates: Optional[int] = Query(None, ge=0, description="Cantidad máxima de laureados"),
+    sort: str = Query("asc", pattern="^(asc|desc)$", description="Orden por año"),
+    limit: Optional[int] = Query(None, gt=0, description="Cantidad máxima de resultados")
+):
+    """
+    Consulta premios combinando rango de años, categorías, motivación general y cantidad de laureados.
+    """
+    prizes = PRIZE_INDEX.query(
+        year_from=year_from,
+        year_to=year_to,
+        categories=category,
+        has_motivation=has_motivation,
+        min_laureates=min_laureates,
+        max_laureates=max_laureates,
+        descending=sort == "desc",
+        limit=limit
+    )
+    if not prizes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No se encontraron premios que cumplan los criterios indicados."
+        )
+    return prizes
+
 @app.get("/prizes/year/{year}", response_model=List[PrizeBase], tags=["Consultas"])
 @limiter.limit(RATE_LIMITS["default"])
 async def get_prizes_by_year(request: Request, year: str):
     """
     Retorna los premios Nobel de un año específico.
     """
-    prizes = data_handler.get_prize_by_year(NOBEL_PRIZES_DATA, year)
+    prizes = STORAGE.get_prize_by_year(year)
     if not prizes:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -138,7 +509,7 @@ async def get_prizes_by_category(request: Request, category: str):
     """
     Retorna los premios Nobel de una categoría específica.
     """
-    prizes = data_handler.get_prize_by_category(NOBEL_PRIZES_DATA, category)
+    prizes = STORAGE.get_prize_by_category(category)
     if not prizes:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -152,7 +523,7 @@ async def get_prize_motivation(request: Request, year: str, category: str):
     """
     Retorna la motivación general de un premio específico por año y categoría.
     """
-    motivation = data_handler.get_prize_motivation(NOBEL_PRIZES_DATA, year, category)
+    motivation = STORAGE.get_prize_motivation(year, category)
     if motivation is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -160,13 +531,28 @@ async def get_prize_motivation(request: Request, year: str, category: str):
         )
     return motivation
 
+@app.get("/prizes/{year}/{category}", response_model=PrizeBase, tags=["Consultas"])
+@limiter.limit(RATE_LIMITS["default"])
+async def get_nobel_prize(request: Request, response: Response, year: str, category: str):
+    """
+    Retorna un premio por año y categoría, con su `ETag` para usar en `If-Match` al modificarlo.
+    """
+    prize = find_prize(year, category)
+    if prize is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontró el premio de '{category}' en el año {year}."
+        )
+    response.headers["ETag"] = prize_etag(prize)
+    return prize
+
 @app.get("/laureates/search", response_model=List[PrizeBase], tags=["Laureados"])
 @limiter.limit(RATE_LIMITS["default"])
 async def search_laureates(request: Request, firstname: str, surname: str):
     """
     Busca premios en los que un laureado específico esté involucrado.
     """
-    found_prizes = data_handler.find_laureate_by_name(NOBEL_PRIZES_DATA, firstname, surname)
+    found_prizes = STORAGE.find_laureate_by_name(firstname, surname)
     if not found_prizes:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -174,13 +560,40 @@ async def search_laureates(request: Request, firstname: str, surname: str):
         )
     return found_prizes
 
+@app.get("/laureates", response_model=LaureatePage, tags=["Laureados"])
+@limiter.limit(RATE_LIMITS["default"])
+async def list_laureates(
+    request: Request,
+    offset: int = Query(0, ge=0, description="Desplazamiento"),
+    limit: int = Query(50, gt=0, le=500, description="Tamaño de la página")
+):
+    """
+    Lista paginada de laureados con sus premios, ordenada por id.
+    """
+    items = [PRIZE_INDEX.laureate_details(laureate_id) for laureate_id in PRIZE_INDEX.laureate_ids(offset, limit)]
+    return LaureatePage(total=PRIZE_INDEX.laureate_count(), offset=offset, limit=limit, items=items)
+
+@app.get("/laureates/{laureate_id}", response_model=LaureateDetail, tags=["Laureados"])
+@limiter.limit(RATE_LIMITS["default"])
+async def get_laureate(request: Request, laureate_id: str):
+    """
+    Obtiene un laureado por su id junto con todos los premios que recibió.
+    """
+    details = PRIZE_INDEX.laureate_details(laureate_id)
+    if details is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontró el laureado con id '{laureate_id}'."
+        )
+    return details
+
 @app.get("/laureates/{year}/{category}", response_model=List[LaureateBase], tags=["Laureados"])
 @limiter.limit(RATE_LIMITS["default"])
 async def get_laureates_by_year_category(request: Request, year: str, category: str):
     """
     Obtiene los laureados de un premio específico por año y categoría.
     """
-    laureates = data_handler.get_laureates_by_year_and_category(NOBEL_PRIZES_DATA, year, category)
+    laureates = STORAGE.get_laureates_by_year_and_category(year, category)
     if not laureates:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -188,12 +601,133 @@ async def get_laureates_by_year_category(request: Request, year: str, category:
         )
     return laureates
 
+@app.get("/export", tags=["Consultas"])
+@limiter.limit(RATE_LIMITS["default"])
+async def export_prizes(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|arrow|parquet)$", description="csv, arrow o parquet")
+):
+    """
+    Exporta todos los premios como tabla plana premio × laureado, enviada por bloques.
+
+    Los formatos `arrow` y `parquet` requieren tener `pyarrow` instalado.
+    """
+    if format != "csv" and not pyarrow_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"El formato '{format}' requiere instalar pyarrow."
+        )
+    exporter = EXPORTERS[format]
+    prizes = list(NOBEL_PRIZES_DATA)
+
+    async def chunks():
+        for chunk in exporter(prizes):
+            if chunk:
+                yield chunk
+
+    return StreamingResponse(
+        chunks(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="nobel_prizes.{format}"'}
+    )
+
+# --- Endpoints de Estadísticas (GET) - Agregados precalculados ---
+
+@app.get("/stats", response_model=Dict[str, int], tags=["Estadísticas"])
+@limiter.limit(RATE_LIMITS["default"])
+async def get_stats_summary(request: Request):
+    """
+    Resumen general de los agregados.
+    """
+    return PRIZE_STATS.summary()
+
+@app.get("/stats/categories/decades", response_model=Dict[str, Dict[str, int]], tags=["Estadísticas"])
+@limiter.limit(RATE_LIMITS["default"])
+async def get_stats_categories_by_decade(request: Request):
+    """
+    Cantidad de premios por categoría y década.
+    """
+    return PRIZE_STATS.categories_by_decade()
+
+@app.get("/stats/shares", response_model=Dict[str, Dict[str, int]], tags=["Estadísticas"])
+@limiter.limit(RATE_LIMITS["default"])
+async def get_stats_shares(request: Request):
+    """
+    Cantidad de premios individuales y compartidos (según `share`) por categoría.
+    """
+    return PRIZE_STATS.share_summary()
+
+@app.get("/stats/laureates/multiple", response_model=List[Dict[str, Any]], tags=["Estadísticas"])
+@limiter.limit(RATE_LIMITS["default"])
+async def get_stats_multiple_laureates(request: Request):
+    """
+    Laureados que recibieron más de un premio.
+    """
+    return list(PRIZE_STATS.multi_laureates.values())
+
+@app.get("/stats/prizes/without-laureates", response_model=List[Dict[str, str]], tags=["Estadísticas"])
+@limiter.limit(RATE_LIMITS["default"])
+async def get_stats_prizes_without_laureates(request: Request):
+    """
+    Premios que no tienen laureados (por ejemplo, años en que no se otorgaron).
+    """
+    return list(PRIZE_STATS.without_laureates.values())
+
+# --- Endpoints de Cambios - Historial y feed de modificaciones ---
+
+@app.get("/changes", response_model=ChangesResponse, tags=["Cambios"])
+@limiter.limit(RATE_LIMITS["default"])
+async def get_changes(
+    request: Request,
+    since: int = Query(..., ge=0, description="Última revisión conocida por el cliente"),
+    epoch: Optional[str] = Query(None, description="Epoch recibido en la respuesta anterior")
+):
+    """
+    Retorna solo las altas, modificaciones y bajas posteriores a `since`.
+
+    Si `since` ya no está en el historial acotado, o el servidor se reinició
+    (epoch distinto), responde `resync_required=true` y el cliente debe descargar `/prizes`.
+    """
+    changes = None if epoch and epoch != CHANGE_FEED.epoch else CHANGE_FEED.changes_since(since)
+    return ChangesResponse(
+        epoch=CHANGE_FEED.epoch,
+        revision=CHANGE_FEED.revision,
+        resync_required=changes is None,
+        changes=changes or []
+    )
+
+@app.get("/changes/stream", tags=["Cambios"])
+@limiter.limit(RATE_LIMITS["default"])
+async def stream_changes(request: Request):
+    """
+    Feed de Server-Sent Events con cada alta, modificación y baja de premios.
+
+    Cada evento lleva `id` = revisión. Con el encabezado `Last-Event-ID` se reenvían
+    primero los cambios perdidos que sigan en el historial; si ya fueron descartados
+    se envía un evento `resync` y el cliente debe recargar el estado completo.
+    Los consumidores que no vacían su buffer a tiempo reciben un evento `dropped`
+    y son desconectados.
+    """
+    backlog = None
+    resync = False
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        backlog = CHANGE_FEED.changes_since(int(last_event_id))
+        resync = backlog is None
+    subscriber = CHANGE_FEED.subscribe()
+    return StreamingResponse(
+        stream_events(CHANGE_FEED, subscriber, backlog=backlog, resync=resync),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # --- Endpoints de Modificación (POST/PUT/DELETE) - Con autenticación ---
 
 @app.post("/prizes", response_model=PrizeBase, status_code=status.HTTP_201_CREATED, tags=["Modificaciones"])
 @limiter.limit(RATE_LIMITS["strict"])
 async def create_nobel_prize(
     request: Request,
+    response: Response,
     prize: PrizeCreate,
     current_user: Dict = Depends(get_current_user)
 ):
@@ -205,26 +739,25 @@ async def create_nobel_prize(
     - Usuario normal: puede crear premios
     - Administrador: puede crear premios
     """
-    for existing_prize in NOBEL_PRIZES_DATA:
-        if (existing_prize.get("year") == prize.year and
-                existing_prize.get("category", "").lower() == prize.category.lower()):
+    ensure_ready()
+    async with WRITE_LOCKS.hold((prize.year, prize.category.lower())):
+        if find_prize(prize.year, prize.category) is not None:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Ya existe un premio en el año {prize.year} para la categoría '{prize.category}'."
             )
 
-    new_prize_data = prize.model_dump(exclude_unset=True)
-    
-    for laureate in new_prize_data.get("laureates", []):
-        if "id" not in laureate or not laureate["id"]:
-            laureate["id"] = f"{laureate.get('firstname', '')}{laureate.get('surname', '')}{prize.year}".replace(" ", "").lower()
-            if not laureate["id"]:
-                laureate["id"] = str(hash(json.dumps(laureate) + str(len(NOBEL_PRIZES_DATA))))
-
-    NOBEL_PRIZES_DATA.append(new_prize_data)
+        new_prize_data = prize.model_dump(exclude_unset=True)
+        
+        for laureate in new_prize_data.get("laureates", []):
+            if "id" not in laureate or not laureate["id"]:
+                laureate["id"] = f"{laureate.get('firstname', '')}{laureate.get('surname', '')}{prize.year}".replace(" ", "").lower()
+                if not laureate["id"]:
+                    laureate["id"] = str(hash(json.dumps(laureate) + str(len(NOBEL_PRIZES_DATA))))
 
-    if not save_nobel_prizes_data_to_file():
-        print("⚠️ ADVERTENCIA: No se pudo guardar el nuevo premio en el archivo JSON.")
+        insert_prize(new_prize_data)
+        await commit_changes(added=[new_prize_data])
+        response.headers["ETag"] = prize_etag(new_prize_data)
 
     return new_prize_data
 
@@ -232,9 +765,11 @@ async def create_nobel_prize(
 @limiter.limit(RATE_LIMITS["strict"])
 async def update_nobel_prize(
     request: Request,
+    response: Response,
     year: str, 
     category: str, 
     prize_update: PrizeUpdate,
+    if_match: Optional[str] = Header(None, description="ETag obtenido al leer el premio"),
     current_user: Dict = Depends(get_current_user)
 ):
     """
@@ -244,36 +779,46 @@ async def update_nobel_prize(
     
     - Usuario normal: puede actualizar premios
     - Administrador: puede actualizar premios
+    - Con `If-Match`, responde 412 si el premio cambió desde que se leyó
     """
-    target_category = category.lower()
-    found_index = -1
-    for i, prize in enumerate(NOBEL_PRIZES_DATA):
-        if prize.get("year") == year and prize.get("category", "").lower() == target_category:
-            found_index = i
-            break
-
-    if found_index == -1:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No se encontró el premio de '{category}' en el año {year}."
-        )
-
-    existing_prize = NOBEL_PRIZES_DATA[found_index]
+    ensure_ready()
     update_data = prize_update.model_dump(exclude_unset=True)
-    
-    if "laureates" in update_data and update_data["laureates"] is not None:
-        existing_prize["laureates"] = update_data["laureates"]
-        for laureate in existing_prize.get("laureates", []):
-            if "id" not in laureate or not laureate["id"]:
-                laureate["id"] = f"{laureate.get('firstname', '')}{laureate.get('surname', '')}{existing_prize.get('year', '')}".replace(" ", "").lower()
-                if not laureate["id"]:
-                    laureate["id"] = str(hash(json.dumps(laureate) + str(len(NOBEL_PRIZES_DATA))))
-        del update_data["laureates"]
+    new_key = ((update_data.get("year") or year), (update_data.get("category") or category).lower())
 
-    existing_prize.update(update_data)
+    async with WRITE_LOCKS.hold((year, category.lower()), new_key):
+        existing_prize = find_prize(year, category)
+        if existing_prize is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No se encontró el premio de '{category}' en el año {year}."
+            )
+        if not if_match_satisfied(if_match, prize_etag(existing_prize)):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"El premio de '{category}' en el año {year} fue modificado por otra solicitud."
+            )
+        if new_key != data_handler.prize_key(existing_prize) and find_prize(*new_key) is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Ya existe un premio en el año {new_key[0]} para la categoría '{new_key[1]}'."
+            )
 
-    if not save_nobel_prizes_data_to_file():
-        print("⚠️ ADVERTENCIA: No se pudieron guardar las actualizaciones en el archivo JSON.")
+        updated_prize = dict(existing_prize)
+        
+        if "laureates" in update_data and update_data["laureates"] is not None:
+            updated_prize["laureates"] = update_data["laureates"]
+            for laureate in updated_prize.get("laureates", []):
+                if "id" not in laureate or not laureate["id"]:
+                    laureate["id"] = f"{laureate.get('firstname', '')}{laureate.get('surname', '')}{updated_prize.get('year', '')}".replace(" ", "").lower()
+                    if not laureate["id"]:
+                        laureate["id"] = str(hash(json.dumps(laureate) + str(len(NOBEL_PRIZES_DATA))))
+            del update_data["laureates"]
+
+        updated_prize.update(update_data)
+        previous = dict(existing_prize)
+        replace_prize(existing_prize, updated_prize)
+        await commit_changes(replaced=[(existing_prize, previous)])
+        response.headers["ETag"] = prize_etag(existing_prize)
 
     return existing_prize
 
@@ -283,6 +828,7 @@ async def delete_nobel_prize(
     request: Request,
     year: str, 
     category: str,
+    if_match: Optional[str] = Header(None, description="ETag obtenido al leer el premio"),
     current_user: Dict = Depends(require_admin)
 ):
     """
@@ -292,26 +838,140 @@ async def delete_nobel_prize(
     
     - Usuario normal: ❌ NO puede eliminar premios
     - Administrador: ✅ Puede eliminar premios
+    - Con `If-Match`, responde 412 si el premio cambió desde que se leyó
     """
-    global NOBEL_PRIZES_DATA
+    ensure_ready()
     target_category = category.lower()
-    initial_len = len(NOBEL_PRIZES_DATA)
+    async with WRITE_LOCKS.hold((year, target_category)):
+        removed = PRIZE_INDEX.find(year, target_category)
+
+        if not removed:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No se encontró el premio de '{category}' en el año {year} para eliminar."
+            )
+        if not if_match_satisfied(if_match, prize_etag(removed[0])):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail=f"El premio de '{category}' en el año {year} fue modificado por otra solicitud."
+            )
+
+        remove_prizes(removed)
+        await commit_changes(removed=removed)
     
-    NOBEL_PRIZES_DATA = [
-        p for p in NOBEL_PRIZES_DATA
-        if not (p.get("year") == year and p.get("category", "").lower() == target_category)
-    ]
+    return None
+
+# --- Endpoints de Administración - Solo administradores ---
 
-    if len(NOBEL_PRIZES_DATA) == initial_len:
+@app.post("/admin/sync", response_model=SyncResult, tags=["Administración"])
+@limiter.limit(RATE_LIMITS["strict"])
+async def sync_nobel_prizes(
+    request: Request,
+    remove_missing: bool = Query(SYNC_REMOVE_MISSING, description="Eliminar los premios que no están en la fuente oficial"),
+    current_user: Dict = Depends(require_admin)
+):
+    """
+    Sincroniza con la fuente oficial aplicando solo los premios nuevos o modificados.
+    Los premios que no están en la fuente (por ejemplo, los creados con POST /prizes)
+    solo se eliminan con `remove_missing=true`.
+
+    **Requiere autenticación Basic con permisos de administrador.**
+    """
+    ensure_ready()
+    result = await run_sync(remove_missing=remove_missing)
+    if result is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No se encontró el premio de '{category}' en el año {year} para eliminar."
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="No se pudieron descargar los datos desde la fuente oficial."
         )
+    return result
 
-    if not save_nobel_prizes_data_to_file():
-        print("⚠️ ADVERTENCIA: No se pudo guardar la eliminación en el archivo JSON.")
-    
-    return None
+@app.post("/admin/reload", response_model=SyncResult, tags=["Administración"])
+@limiter.limit(RATE_LIMITS["strict"])
+async def reload_nobel_prizes(
+    request: Request,
+    current_user: Dict = Depends(require_admin)
+):
+    """
+    Recarga nobel_prizes.json sin reiniciar el servidor, aplicando solo los premios que cambiaron.
+
+    **Requiere autenticación Basic con permisos de administrador.**
+    """
+    ensure_ready()
+    result = await reload_data_file()
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"El archivo '{LOCAL_JSON_FILE}' no existe, no es válido o no contiene premios."
+        )
+    return result
+
+@app.post("/admin/profiler", response_model=ProfilerStatus, tags=["Administración"])
+@limiter.limit(RATE_LIMITS["admin"])
+async def start_profiler(
+    request: Request,
+    seconds: Optional[float] = Query(None, gt=0, description="Duración máxima del perfilado"),
+    requests: Optional[int] = Query(None, gt=0, description="Cantidad máxima de solicitudes a perfilar"),
+    route: Optional[str] = Query(None, description="Perfilar solo las rutas con este prefijo"),
+    current_user: Dict = Depends(require_admin)
+):
+    """
+    Activa el perfilador por muestreo durante N segundos o N solicitudes.
+
+    **Requiere autenticación Basic con permisos de administrador.**
+    """
+    if seconds is None and requests is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Debe indicar 'seconds' o 'requests' para acotar el perfilado."
+        )
+    if not profiler.start(seconds=seconds, max_requests=requests, route=route):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ya hay un perfilado en curso."
+        )
+    return profiler.status()
+
+@app.get("/admin/profiler", response_class=PlainTextResponse, tags=["Administración"])
+@limiter.limit(RATE_LIMITS["admin"])
+async def get_profiler_dump(
+    request: Request,
+    current_user: Dict = Depends(require_admin)
+):
+    """
+    Retorna las muestras en formato de pilas colapsadas (compatible con flamegraph.pl / speedscope).
+
+    **Requiere autenticación Basic con permisos de administrador.**
+    """
+    return PlainTextResponse(profiler.collapsed())
+
+@app.delete("/admin/profiler", response_model=ProfilerStatus, tags=["Administración"])
+@limiter.limit(RATE_LIMITS["admin"])
+async def stop_profiler(
+    request: Request,
+    current_user: Dict = Depends(require_admin)
+):
+    """
+    Detiene el perfilador antes de tiempo y retorna su estado.
+
+    **Requiere autenticación Basic con permisos de administrador.**
+    """
+    profiler.stop()
+    return profiler.status()
+
+@app.get("/admin/admission", response_model=Dict[str, AdmissionPoolStatus], tags=["Administración"])
+@limiter.limit(RATE_LIMITS["admin"])
+async def get_admission_status(
+    request: Request,
+    current_user: Dict = Depends(require_admin)
+):
+    """
+    Retorna el estado de los pools de admisión: límite adaptativo, solicitudes en curso,
+    cola, latencia observada y rechazos.
+
+    **Requiere autenticación Basic con permisos de administrador.**
+    """
+    return admission.status()
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
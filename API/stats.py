@@ -0,0 +1,115 @@
+"""
+Agregados precalculados para los endpoints /stats de la API Unificada de Premios Nobel
+Se construyen al cargar los datos y se actualizan de forma incremental en cada modificación
+"""
+
+import os
+import sys
+from collections import defaultdict
+from typing import Dict, Any, Tuple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Etapa1.data_handler import prize_key
+
+def is_shared(prize: Dict[str, Any]) -> bool:
+    """Un premio es compartido si algún laureado recibió una fracción (share distinto de '1')."""
+    laureates = prize.get("laureates") or []
+    if len(laureates) > 1:
+        return True
+    return any(str(l.get("share") or "1") != "1" for l in laureates)
+
+class PrizeStats:
+    """
+    Contadores agregados por categoría, década y laureado.
+    Cada consulta retorna una estructura ya calculada, sin recorrer los premios.
+    """
+
+    def __init__(self):
+        self.total_prizes = 0
+        self.by_category_decade: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.shares: Dict[str, Dict[str, int]] = defaultdict(lambda: {"solo": 0, "shared": 0})
+        self.laureate_prizes: Dict[str, int] = defaultdict(int)
+        self.laureate_names: Dict[str, Dict[str, Any]] = {}
+        self.multi_laureates: Dict[str, Dict[str, Any]] = {}
+        self.without_laureates: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+    @staticmethod
+    def _decade(year: str) -> int:
+        try:
+            return int(year) // 10 * 10
+        except (TypeError, ValueError):
+            return 0
+
+    def add(self, prize: Dict[str, Any]):
+        """Incorpora un premio a los agregados."""
+        self._apply(prize, 1)
+
+    def remove(self, prize: Dict[str, Any]):
+        """Quita un premio de los agregados (debe ser el mismo estado que se agregó)."""
+        self._apply(prize, -1)
+
+    def _apply(self, prize: Dict[str, Any], delta: int):
+        category = prize.get("category", "").lower()
+        key = prize_key(prize)
+        self.total_prizes += delta
+
+        decades = self.by_category_decade[category]
+        decade = self._decade(prize.get("year"))
+        decades[decade] += delta
+        if decades[decade] <= 0:
+            del decades[decade]
+            if not decades:
+                del self.by_category_decade[category]
+
+        shares = self.shares[category]
+        shares["shared" if is_shared(prize) else "solo"] += delta
+        if shares["solo"] <= 0 and shares["shared"] <= 0:
+            del self.shares[category]
+
+        laureates = prize.get("laureates") or []
+        if not laureates:
+            if delta > 0:
+                self.without_laureates[key] = {"year": key[0], "category": prize.get("category", "")}
+            else:
+                self.without_laureates.pop(key, None)
+
+        for laureate in laureates:
+            laureate_id = laureate.get("id")
+            if not laureate_id:
+                continue
+            count = self.laureate_prizes[laureate_id] + delta
+            if count <= 0:
+                self.laureate_prizes.pop(laureate_id, None)
+                self.laureate_names.pop(laureate_id, None)
+            else:
+                self.laureate_prizes[laureate_id] = count
+                if delta > 0:
+                    self.laureate_names[laureate_id] = {
+                        "firstname": laureate.get("firstname"),
+                        "surname": laureate.get("surname"),
+                    }
+            if count >= 2:
+                self.multi_laureates[laureate_id] = {
+                    "id": laureate_id,
+                    **self.laureate_names.get(laureate_id, {}),
+                    "prizes": count,
+                }
+            else:
+                self.multi_laureates.pop(laureate_id, None)
+
+    def categories_by_decade(self) -> Dict[str, Dict[str, int]]:
+        return {
+            category: {str(decade): count for decade, count in sorted(decades.items())}
+            for category, decades in self.by_category_decade.items()
+        }
+
+    def share_summary(self) -> Dict[str, Dict[str, int]]:
+        return {category: dict(counts) for category, counts in self.shares.items()}
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "total_prizes": self.total_prizes,
+            "categories": len(self.by_category_decade),
+            "distinct_laureates": len(self.laureate_prizes),
+            "laureates_with_multiple_prizes": len(self.multi_laureates),
+            "prizes_without_laureates": len(self.without_laureates),
+        }
@@ -0,0 +1,355 @@
+"""
+Backends de almacenamiento para la API Unificada de Premios Nobel
+JSONStorage (archivo JSON, por defecto) y SQLiteStorage (tablas normalizadas con índices)
+"""
+
+import copy
+import json
+import os
+import sqlite3
+import sys
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Etapa1 import data_handler
+
+PrizeKey = Tuple[str, str]
+FileSignature = Tuple[int, int]
+
+def file_signature(filename: str) -> Optional[FileSignature]:
+    """(mtime en ns, tamaño) de un archivo, o None si no existe."""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class StorageBackend(ABC):
+    """
+    Interfaz común de persistencia y consultas.
+
+    El servidor mantiene la lista de premios en memoria para sus índices; el backend
+    se encarga de persistir los cambios y de resolver las consultas de data_handler.
+    Cada modificación se aplica primero en memoria y se persiste antes de responder:
+    mientras dura la escritura, las consultas del backend (en SQLite) todavía no la ven,
+    y si la escritura falla el servidor la deshace en memoria y responde 500. Varios
+    procesos sobre el mismo archivo no se sincronizan.
+    """
+
+    @abstractmethod
+    def exists(self) -> bool:
+        """Indica si ya hay datos persistidos para cargar."""
+
+    def is_own_write(self, signature: Optional[FileSignature]) -> bool:
+        """Indica si el archivo JSON con esa firma fue escrito por este backend."""
+        return False
+
+    @abstractmethod
+    def load_prizes(self, on_prize: Optional[Callable[[dict], None]] = None,
+                    progress: Optional[Callable[[int, int, int], None]] = None) -> list:
+        """
+        Carga todos los premios, invocando on_prize con cada uno. Si los datos no se
+        pueden leer lanza una excepción: una lista vacía significa que no hay premios.
+        """
+
+    @abstractmethod
+    def prepare_persist(self, prizes: List[Dict[str, Any]], upserted: Iterable[Dict[str, Any]] = (),
+                        removed_keys: Iterable[PrizeKey] = ()) -> Callable[[], bool]:
+        """
+        Toma en el hilo actual una copia de lo necesario para persistir una modificación y
+        retorna la escritura como función sin argumentos, para ejecutarla en otro hilo.
+        `prizes` es el estado completo en memoria, `upserted` los premios nuevos o
+        modificados y `removed_keys` las claves eliminadas.
+        """
+
+    def persist(self, prizes: List[Dict[str, Any]], upserted: Iterable[Dict[str, Any]] = (),
+                removed_keys: Iterable[PrizeKey] = ()) -> bool:
+        """Persiste una modificación en el hilo actual."""
+        return self.prepare_persist(prizes, upserted, removed_keys)()
+
+    @abstractmethod
+    def get_prize_by_year(self, year: str) -> list:
+        ...
+
+    @abstractmethod
+    def get_prize_by_category(self, category: str) -> list:
+        ...
+
+    @abstractmethod
+    def get_prize_motivation(self, year: str, category: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def find_laureate_by_name(self, firstname: str, surname: str) -> list:
+        ...
+
+    @abstractmethod
+    def get_laureates_by_year_and_category(self, year: str, category: str) -> list:
+        ...
+
+class JSONStorage(StorageBackend):
+    """Backend por defecto: reescribe el archivo JSON completo y consulta la lista en memoria."""
+
+    def __init__(self, filename: str, get_prizes: Callable[[], List[Dict[str, Any]]]):
+        self.filename = filename
+        self.get_prizes = get_prizes
+        self._write_lock = threading.Lock()
+        self._snapshot_seq = 0
+        self._written_seq = 0
+        self._own_signatures: deque = deque(maxlen=8)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.filename)
+
+    def is_own_write(self, signature):
+        return signature is not None and signature in self._own_signatures
+
+    def load_prizes(self, on_prize=None, progress=None) -> list:
+        return data_handler.read_nobel_prizes_data(self.filename, on_prize=on_prize, progress=progress)
+
+    def prepare_persist(self, prizes, upserted=(), removed_keys=()):
+        """
+        Serializa el estado completo en el hilo actual. Si varias escrituras terminan
+        fuera de orden, una instantánea más vieja nunca pisa a una más nueva.
+        """
+        self._snapshot_seq += 1
+        seq = self._snapshot_seq
+        data_to_save = json.dumps({"prizes": prizes}, ensure_ascii=False, indent=4)
+
+        def write() -> bool:
+            with self._write_lock:
+                if seq < self._written_seq:
+                    return True
+                try:
+                    with open(self.filename, 'w', encoding='utf-8') as f:
+                        f.write(data_to_save)
+                    self._written_seq = seq
+                    self._own_signatures.append(file_signature(self.filename))
+                    return True
+                except IOError as e:
+                    print(f"❌ ERROR: No se pudo guardar los datos: {e}")
+                    return False
+
+        return write
+
+    def get_prize_by_year(self, year):
+        return data_handler.get_prize_by_year(self.get_prizes(), year)
+
+    def get_prize_by_category(self, category):
+        return data_handler.get_prize_by_category(self.get_prizes(), category)
+
+    def get_prize_motivation(self, year, category):
+        return data_handler.get_prize_motivation(self.get_prizes(), year, category)
+
+    def find_laureate_by_name(self, firstname, surname):
+        return data_handler.find_laureate_by_name(self.get_prizes(), firstname, surname)
+
+    def get_laureates_by_year_and_category(self, year, category):
+        return data_handler.get_laureates_by_year_and_category(self.get_prizes(), year, category)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prizes (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    year TEXT NOT NULL,
+    category TEXT NOT NULL,
+    category_key TEXT NOT NULL,
+    overall_motivation TEXT,
+    has_laureates INTEGER NOT NULL,
+    UNIQUE (year, category_key)
+);
+CREATE INDEX IF NOT EXISTS idx_prizes_category ON prizes (category_key, year);
+CREATE INDEX IF NOT EXISTS idx_prizes_position ON prizes (position);
+CREATE TABLE IF NOT EXISTS laureates (
+    prize_id INTEGER NOT NULL REFERENCES prizes (id) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    laureate_id TEXT,
+    firstname TEXT,
+    surname TEXT,
+    firstname_key TEXT NOT NULL,
+    surname_key TEXT NOT NULL,
+    motivation TEXT,
+    share TEXT,
+    PRIMARY KEY (prize_id, ordinal)
+);
+CREATE INDEX IF NOT EXISTS idx_laureates_id ON laureates (laureate_id);
+CREATE INDEX IF NOT EXISTS idx_laureates_name ON laureates (surname_key, firstname_key);
+"""
+
+SELECT_PRIZE_COLUMNS = "SELECT id, year, category, overall_motivation, has_laureates FROM prizes"
+SELECT_LAUREATES_WHERE = (
+    "SELECT prize_id, laureate_id, firstname, surname, motivation, share FROM laureates "
+    "WHERE prize_id IN (SELECT id FROM prizes WHERE {where}) ORDER BY prize_id, ordinal"
+)
+SELECT_ALL_LAUREATES = (
+    "SELECT prize_id, laureate_id, firstname, surname, motivation, share FROM laureates "
+    "ORDER BY prize_id, ordinal"
+)
+UPDATE_PRIZE = (
+    "UPDATE prizes SET category = ?, overall_motivation = ?, has_laureates = ? "
+    "WHERE year = ? AND category_key = ? RETURNING id"
+)
+INSERT_PRIZE = (
+    "INSERT INTO prizes (position, year, category, category_key, overall_motivation, has_laureates) "
+    "VALUES ((SELECT COALESCE(MAX(position), 0) + 1 FROM prizes), ?, ?, ?, ?, ?)"
+)
+INSERT_LAUREATE = (
+    "INSERT INTO laureates (prize_id, ordinal, laureate_id, firstname, surname, firstname_key, "
+    "surname_key, motivation, share) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+DELETE_LAUREATES = "DELETE FROM laureates WHERE prize_id = ?"
+DELETE_PRIZE = "DELETE FROM prizes WHERE year = ? AND category_key = ?"
+
+class SQLiteStorage(StorageBackend):
+    """
+    Backend SQLite con tablas normalizadas de premios y laureados, índices por
+    año, categoría, nombre e id de laureado, y modo WAL para lectores concurrentes.
+    Todas las sentencias son constantes con parámetros, por lo que sqlite3 las
+    reutiliza desde su caché de sentencias preparadas.
+
+    Las consultas usan `conn` desde el event loop y las escrituras usan `write_conn`
+    desde hilos de trabajo; con WAL los lectores no esperan al escritor.
+    """
+
+    def __init__(self, filename: str, import_from: Optional[str] = None):
+        self.filename = filename
+        self.import_from = import_from
+        self._lock = threading.Lock()
+        self.write_conn = self._connect()
+        self.write_conn.execute("PRAGMA journal_mode=WAL")
+        self.write_conn.executescript(SCHEMA)
+        self.conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.filename, check_same_thread=False, cached_statements=64)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM prizes").fetchone()[0]
+
+    def exists(self) -> bool:
+        return self._count() > 0 or bool(self.import_from and os.path.exists(self.import_from))
+
+    def load_prizes(self, on_prize=None, progress=None) -> list:
+        """Carga con una conexión propia, por lo que puede ejecutarse en un hilo aparte."""
+        conn = self._connect()
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM prizes").fetchone()[0]
+            if total == 0 and self.import_from and os.path.exists(self.import_from):
+                print(f"📥 Importando '{self.import_from}' a la base SQLite '{self.filename}'...")
+                imported = data_handler.read_nobel_prizes_data(self.import_from)
+                if not self.persist(imported, upserted=imported):
+                    raise sqlite3.DatabaseError(f"No se pudo importar '{self.import_from}'")
+                total = conn.execute("SELECT COUNT(*) FROM prizes").fetchone()[0]
+
+            laureates_by_prize: Dict[int, List[Dict[str, Any]]] = {}
+            for row in conn.execute(SELECT_ALL_LAUREATES):
+                laureates_by_prize.setdefault(row[0], []).append(self._laureate_from_row(row))
+
+            prizes = []
+            for row in conn.execute(SELECT_PRIZE_COLUMNS + " ORDER BY position"):
+                prize = self._prize_from_row(row, laureates_by_prize.get(row[0], []))
+                prizes.append(prize)
+                if on_prize:
+                    on_prize(prize)
+                if progress and (len(prizes) % 1000 == 0 or len(prizes) == total):
+                    progress(len(prizes), total, len(prizes))
+            return prizes
+        finally:
+            conn.close()
+
+    def prepare_persist(self, prizes, upserted=(), removed_keys=()):
+        """Copia solo las filas afectadas; la transacción corre luego en `write_conn`."""
+        upserted = copy.deepcopy(list(upserted))
+        removed_keys = list(removed_keys)
+
+        def write() -> bool:
+            try:
+                with self._lock, self.write_conn:
+                    for year, category_key in removed_keys:
+                        self.write_conn.execute(DELETE_PRIZE, (year, category_key))
+                    for prize in upserted:
+                        self._upsert(self.write_conn, prize)
+                return True
+            except sqlite3.Error as e:
+                print(f"❌ ERROR: No se pudo guardar los datos en SQLite: {e}")
+                return False
+
+        return write
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, prize: Dict[str, Any]):
+        year, category_key = data_handler.prize_key(prize)
+        laureates = prize.get("laureates")
+        values = (prize.get("category", ""), prize.get("overallMotivation"), int(laureates is not None))
+        row = conn.execute(UPDATE_PRIZE, values + (year, category_key)).fetchone()
+        if row is not None:
+            prize_id = row[0]
+            conn.execute(DELETE_LAUREATES, (prize_id,))
+        else:
+            cursor = conn.execute(INSERT_PRIZE, (year, values[0], category_key, values[1], values[2]))
+            prize_id = cursor.lastrowid
+        conn.executemany(INSERT_LAUREATE, [
+            (
+                prize_id, ordinal, l.get("id"), l.get("firstname"), l.get("surname"),
+                (l.get("firstname") or "").lower(), (l.get("surname") or "").lower(),
+                l.get("motivation"), l.get("share"),
+            )
+            for ordinal, l in enumerate(laureates or [])
+        ])
+
+    @staticmethod
+    def _laureate_from_row(row) -> Dict[str, Any]:
+        laureate = {"id": row[1], "firstname": row[2]}
+        for key, value in (("surname", row[3]), ("motivation", row[4]), ("share", row[5])):
+            if value is not None:
+                laureate[key] = value
+        return laureate
+
+    @staticmethod
+    def _prize_from_row(row, laureates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        prize = {"year": row[1], "category": row[2]}
+        if row[3] is not None:
+            prize["overallMotivation"] = row[3]
+        if row[4]:
+            prize["laureates"] = laureates
+        return prize
+
+    def _fetch_prizes(self, where: str, params: tuple) -> list:
+        """Dos consultas en total: los premios y luego todos sus laureados de una vez."""
+        rows = self.conn.execute(f"{SELECT_PRIZE_COLUMNS} WHERE {where} ORDER BY position", params).fetchall()
+        if not rows:
+            return []
+        laureates_by_prize: Dict[int, List[Dict[str, Any]]] = {}
+        for row in self.conn.execute(SELECT_LAUREATES_WHERE.format(where=where), params):
+            laureates_by_prize.setdefault(row[0], []).append(self._laureate_from_row(row))
+        return [self._prize_from_row(row, laureates_by_prize.get(row[0], [])) for row in rows]
+
+    def get_prize_by_year(self, year):
+        return self._fetch_prizes("year = ?", (year,))
+
+    def get_prize_by_category(self, category):
+        return self._fetch_prizes("category_key = ?", (category.lower(),))
+
+    def get_prize_motivation(self, year, category):
+        row = self.conn.execute(
+            "SELECT overall_motivation FROM prizes WHERE year = ? AND category_key = ?",
+            (year, category.lower())
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0] if row[0] is not None else "No hay motivación general disponible para este premio."
+
+    def find_laureate_by_name(self, firstname, surname):
+        return self._fetch_prizes(
+            "id IN (SELECT prize_id FROM laureates WHERE surname_key = ? AND firstname_key = ?)",
+            (surname.lower(), firstname.lower())
+        )
+
+    def get_laureates_by_year_and_category(self, year, category):
+        prizes = self._fetch_prizes("year = ? AND category_key = ?", (year, category.lower()))
+        return prizes[0].get("laureates", []) if prizes else []
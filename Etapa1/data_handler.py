@@ -1,6 +1,9 @@
 import requests
+import codecs
 import json
 import os
+import sys
+from typing import Callable, Iterable, Iterator
 
 
 NOBEL_PRIZES_URL = "https://api.nobelprize.org/v1/prize.json"
@@ -37,12 +40,267 @@ def download_nobel_prizes_data(url: str = NOBEL_PRIZES_URL, filename: str = LOCA
         print(f"Error de E/S al guardar el archivo: {e}")
         return False
 
-def load_nobel_prizes_data(filename: str = LOCAL_JSON_FILE) -> list:
+def fetch_nobel_prizes_stream(url: str = NOBEL_PRIZES_URL, chunk_size: int = 64 * 1024, timeout: float = 30) -> list | None:
     """
-    Carga los datos de los premios Nobel desde el archivo JSON local.
+    Descarga el JSON de premios Nobel en modo streaming, decodificando premio por premio
+    a medida que llegan los bloques, sin escribirlo a disco ni armar el árbol completo.
+
+    Args:
+        url (str): La URL desde donde descargar el archivo.
+        chunk_size (int): Tamaño de cada bloque leído de la conexión.
+        timeout (float): Tiempo máximo de espera de la conexión, en segundos.
+
+    Returns:
+        list | None: La lista de premios válidos descargada, o None si hubo un error o la
+                     respuesta no es un objeto con un arreglo "prizes" de objetos.
+    """
+    print(f"Sincronizando datos desde: {url}")
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            prizes = list(iter_prizes_from_chunks(response.iter_content(chunk_size=chunk_size)))
+    except requests.exceptions.RequestException as e:
+        print(f"Error al descargar los datos: {e}")
+        return None
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        print(f"Error al decodificar JSON: {e}")
+        return None
+
+    valid = [prize for prize in prizes if is_valid_prize(prize)]
+    if len(valid) < len(prizes):
+        print(f"⚠️ Se descartaron {len(prizes) - len(valid)} premios sin año, categoría o laureados válidos.")
+    return valid
+
+def is_valid_prize(prize: dict) -> bool:
+    """Un premio necesita año y categoría de texto, y laureados como lista de objetos si los tiene."""
+    laureates = prize.get("laureates")
+    return (
+        isinstance(prize.get("year"), str) and bool(prize["year"])
+        and isinstance(prize.get("category"), str) and bool(prize["category"])
+        and (laureates is None or (isinstance(laureates, list) and all(isinstance(l, dict) for l in laureates)))
+    )
+
+def prize_key(prize: dict) -> tuple:
+    """Clave única de un premio: (año, categoría en minúsculas). Tolera valores nulos."""
+    return str(prize.get("year") or ""), str(prize.get("category") or "").lower()
+
+def diff_prizes(current: list, incoming: list, remove_missing: bool = True) -> dict:
+    """
+    Compara dos listas de premios por (año, categoría).
+
+    Args:
+        remove_missing (bool): Si es False, los premios actuales que no están en `incoming`
+                               se conservan ("removed" queda vacío).
+
+    Returns:
+        dict: {"added": [...], "updated": [...], "removed": [...]} donde "added" y
+              "updated" contienen los premios nuevos y "removed" los premios actuales que ya no existen.
+    """
+    current_by_key = {prize_key(p): p for p in current}
+    incoming_keys = set()
+    added, updated = [], []
+    for prize in incoming:
+        key = prize_key(prize)
+        incoming_keys.add(key)
+        existing = current_by_key.get(key)
+        if existing is None:
+            added.append(prize)
+        elif existing != prize:
+            updated.append(prize)
+    removed = [p for key, p in current_by_key.items() if key not in incoming_keys] if remove_missing else []
+    return {"added": added, "updated": updated, "removed": removed}
+
+_INTERNED_VALUES = ("year", "category", "share")
+_JSON_WHITESPACE = " \t\r\n"
+
+def _compact_object(pairs: list) -> dict:
+    """
+    Construye cada objeto JSON compartiendo (sys.intern) las claves y los valores
+    muy repetidos, ya que al decodificar premio por premio json no reutiliza las cadenas.
+    """
+    obj = {}
+    for key, value in pairs:
+        key = sys.intern(key)
+        if key in _INTERNED_VALUES and isinstance(value, str):
+            value = sys.intern(value)
+        obj[key] = value
+    return obj
+
+_STREAM_DECODER = json.JSONDecoder(object_pairs_hook=_compact_object)
+_PLAIN_DECODER = json.JSONDecoder()
+
+class _JSONStream:
+    """Texto JSON decodificado a demanda desde un iterador de bloques de bytes UTF-8."""
+
+    def __init__(self, chunks: Iterable[bytes], on_read: Callable[[int], None] | None = None):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._on_read = on_read
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def fill(self) -> bool:
+        """Lee el siguiente bloque descartando lo ya consumido. Retorna False si ya no hay más."""
+        if self.eof:
+            return False
+        chunk = next(self._chunks, b"")
+        self.eof = not chunk
+        self.bytes_read += len(chunk)
+        self.buffer = self.buffer[self.pos:] + self._decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+        if self._on_read:
+            self._on_read(self.bytes_read)
+        return True
+
+    def peek(self) -> str:
+        """Saltea espacios y retorna el siguiente carácter, o "" al final del documento."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise self.error(f"Se esperaba '{char}'")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder):
+        """Decodifica un valor completo, leyendo más bloques si quedó cortado."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # Un número al final del buffer puede continuar en el siguiente bloque.
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+def iter_prizes_from_chunks(chunks: Iterable[bytes],
+                            on_read: Callable[[int], None] | None = None) -> Iterator[dict]:
+    """
+    Recorre el arreglo "prizes" del objeto JSON de nivel superior premio por premio,
+    a partir de bloques de bytes (de un archivo o de una descarga).
+    La memoria usada queda acotada por el premio en curso y no por el árbol completo.
+    El documento se valida completo: separadores, clave "prizes" única y sin datos extra.
+
+    Args:
+        chunks (iterable): Bloques de bytes UTF-8.
+        on_read (callable): Se invoca con la cantidad total de bytes leídos tras cada bloque.
+
+    Raises:
+        json.JSONDecodeError: Si el documento está malformado, no contiene "prizes"
+                              o algún premio no es un objeto.
+        UnicodeDecodeError: Si los bytes no son UTF-8 válido.
+    """
+    stream = _JSONStream(chunks, on_read)
+    found = False
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.pos += 1
+    else:
+        while True:
+            if stream.peek() != '"':
+                raise stream.error("Se esperaba una clave")
+            key = stream.value(_PLAIN_DECODER)
+            stream.expect(":")
+            if key != "prizes":
+                stream.value(_PLAIN_DECODER)
+            elif found:
+                raise stream.error('Clave "prizes" duplicada')
+            else:
+                found = True
+                stream.expect("[")
+                if stream.peek() == "]":
+                    stream.pos += 1
+                else:
+                    while True:
+                        prize = stream.value(_STREAM_DECODER)
+                        if not isinstance(prize, dict):
+                            raise stream.error("Cada premio debe ser un objeto")
+                        yield prize
+                        separator = stream.peek()
+                        if separator not in (",", "]"):
+                            raise stream.error("Se esperaba ',' o ']'")
+                        stream.pos += 1
+                        if separator == "]":
+                            break
+            separator = stream.peek()
+            if separator not in (",", "}"):
+                raise stream.error("Se esperaba ',' o '}'")
+            stream.pos += 1
+            if separator == "}":
+                break
+    if stream.peek() != "":
+        raise stream.error("Datos extra después del objeto")
+    if not found:
+        raise stream.error('No se encontró el arreglo "prizes"')
+
+def iter_nobel_prizes(filename: str = LOCAL_JSON_FILE, chunk_size: int = 64 * 1024,
+                      progress: Callable[[int, int, int], None] | None = None) -> Iterator[dict]:
+    """
+    Recorre el arreglo "prizes" del archivo JSON premio por premio, leyendo por bloques.
 
     Args:
         filename (str): El nombre del archivo JSON local.
+        chunk_size (int): Cantidad de bytes leídos por bloque.
+        progress (callable): Se invoca como progress(bytes_leidos, bytes_totales, premios) tras cada bloque.
+
+    Raises:
+        json.JSONDecodeError: Ver iter_prizes_from_chunks.
+    """
+    total_bytes = os.path.getsize(filename)
+    count = 0
+
+    def report(bytes_read: int):
+        if progress:
+            progress(bytes_read, total_bytes, count)
+
+    with open(filename, 'rb') as f:
+        for prize in iter_prizes_from_chunks(iter(lambda: f.read(chunk_size), b""), on_read=report):
+            count += 1
+            yield prize
+
+def read_nobel_prizes_data(filename: str = LOCAL_JSON_FILE,
+                           on_prize: Callable[[dict], None] | None = None,
+                           progress: Callable[[int, int, int], None] | None = None) -> list:
+    """
+    Igual que load_nobel_prizes_data, pero propaga los errores en lugar de retornar
+    una lista vacía, para distinguir un archivo vacío de uno truncado o corrupto.
+
+    Raises:
+        OSError: Si el archivo no existe o no se puede leer.
+        json.JSONDecodeError, UnicodeDecodeError: Si el archivo no es un JSON válido.
+    """
+    prizes = []
+    for prize in iter_nobel_prizes(filename, progress=progress):
+        prizes.append(prize)
+        if on_prize:
+            on_prize(prize)
+    return prizes
+
+def load_nobel_prizes_data(filename: str = LOCAL_JSON_FILE,
+                           on_prize: Callable[[dict], None] | None = None,
+                           progress: Callable[[int, int, int], None] | None = None) -> list:
+    """
+    Carga los datos de los premios Nobel desde el archivo JSON local, premio por premio.
+
+    Args:
+        filename (str): El nombre del archivo JSON local.
+        on_prize (callable): Se invoca con cada premio a medida que se carga (por ejemplo, para indexarlo).
+        progress (callable): Ver iter_nobel_prizes.
 
     Returns:
         list: Una lista de diccionarios, donde cada diccionario representa un premio Nobel.
@@ -52,10 +310,8 @@ def load_nobel_prizes_data(filename: str = LOCAL_JSON_FILE) -> list:
         print(f"El archivo '{filename}' no existe. Intenta descargarlo primero.")
         return []
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get("prizes", [])
-    except json.JSONDecodeError as e:
+        return read_nobel_prizes_data(filename, on_prize=on_prize, progress=progress)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
         print(f"Error al decodificar el JSON desde '{filename}': {e}")
         return []
     except IOError as e: